@@ -0,0 +1,219 @@
+"""
+Two-tier (memory and disk) cache for downloaded album art.
+"""
+import asyncio
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "~/.cache/music-screen-api/art"
+DEFAULT_DISK_BUDGET_MB = 50
+DEFAULT_MEMORY_ITEMS = 8
+
+
+def normalize_uri(uri):
+    """Return a stable cache key for an album art URI."""
+    parts = urlsplit(uri.strip())
+    netloc = parts.netloc.lower()
+    if parts.path == "/getaa":
+        # Art served by a speaker is identical whichever speaker serves it
+        netloc = ""
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), netloc, parts.path, query, ""))
+
+
+class AlbumArtCache():
+    """LRU cache of raw image data keyed by normalized image URI.
+
+    The index is kept on the event loop, file access runs in the default executor.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, disk_budget=DEFAULT_DISK_BUDGET_MB * 1024 * 1024, memory_items=DEFAULT_MEMORY_ITEMS):
+        """Initialize the cache. A `cache_dir` of None disables the disk tier."""
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        self.disk_budget = disk_budget
+        self.memory_items = memory_items
+
+        self._memory = OrderedDict()
+        self._disk = None
+        self._disk_size = 0
+        self._scan_task = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    @property
+    def stats(self):
+        """Return the hit/miss counters."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((lookups - self.misses) / lookups, 3) if lookups else None,
+            "bytes_saved": self.bytes_saved,
+            "memory_items": len(self._memory),
+            "disk_items": len(self._disk) if self._disk is not None else None,
+            "disk_bytes": self._disk_size,
+        }
+
+    @staticmethod
+    def _filename(key):
+        """Return the on-disk filename for a cache key."""
+        return hashlib.sha1(key.encode("utf-8")).hexdigest() + ".img"
+
+    def _disable_disk(self, err):
+        """Stop using the disk tier after an unrecoverable error."""
+        _LOGGER.warning("Album art disk cache disabled, cannot use %s [%s]", self.cache_dir, err)
+        self.cache_dir = None
+        self._disk = None
+        self._disk_size = 0
+
+    def _scan_disk(self):
+        """Return (mtime, name, size) of every cached file, creating the directory if needed."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".img"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name, stat.st_size))
+        return entries
+
+    async def _load_disk_index(self):
+        """Build the disk LRU index from file modification times, scanning the directory in the executor."""
+        if self._disk is not None or not self.cache_dir:
+            return
+        if self._scan_task is None:
+            loop = asyncio.get_running_loop()
+            self._scan_task = asyncio.ensure_future(loop.run_in_executor(None, self._scan_disk))
+        task = self._scan_task
+        try:
+            entries = await asyncio.shield(task)
+        except OSError as err:
+            if self.cache_dir:
+                self._disable_disk(err)
+            return
+        finally:
+            if task.done() and self._scan_task is task:
+                self._scan_task = None
+        if self._disk is not None or not self.cache_dir:
+            return
+
+        self._disk = OrderedDict()
+        self._disk_size = 0
+        for _, name, size in sorted(entries):
+            self._disk[name] = size
+            self._disk_size += size
+        _LOGGER.debug("Album art disk cache loaded: %s files, %s bytes", len(self._disk), self._disk_size)
+
+    def _remember(self, key, data):
+        """Store data in the memory tier, evicting the oldest entry if full."""
+        if self.memory_items <= 0:
+            return
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    async def get(self, uri):
+        """Return cached image data for a URI, or None."""
+        key = normalize_uri(uri)
+
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            self.bytes_saved += len(data)
+            return data
+
+        await self._load_disk_index()
+        name = self._filename(key)
+        if self._disk and name in self._disk:
+            path = os.path.join(self.cache_dir, name)
+            loop = asyncio.get_running_loop()
+            try:
+                data = await loop.run_in_executor(None, _read_file, path)
+            except OSError as err:
+                _LOGGER.debug("Dropping unreadable cache entry %s [%s]", path, err)
+                if self._disk is not None:
+                    self._disk_size -= self._disk.pop(name, 0)
+            else:
+                # The entry may have been evicted while it was read
+                if self._disk is not None and name in self._disk:
+                    self._disk.move_to_end(name)
+                self.disk_hits += 1
+                self.bytes_saved += len(data)
+                self._remember(key, data)
+                return data
+
+        self.misses += 1
+        return None
+
+    async def put(self, uri, data):
+        """Add image data for a URI to both cache tiers."""
+        if not data:
+            return
+        key = normalize_uri(uri)
+        self._remember(key, data)
+
+        await self._load_disk_index()
+        if self._disk is None or len(data) > self.disk_budget:
+            return
+
+        name = self._filename(key)
+        path = os.path.join(self.cache_dir, name)
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, _write_file, path, data)
+        except OSError as err:
+            if self.cache_dir:
+                self._disable_disk(err)
+            return
+        if self._disk is None:
+            return
+
+        self._disk_size += len(data) - self._disk.pop(name, 0)
+        self._disk[name] = len(data)
+        await self._evict()
+
+    async def _evict(self):
+        """Remove least recently used files until within the disk budget."""
+        paths = []
+        while self._disk_size > self.disk_budget and self._disk:
+            name, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            paths.append(os.path.join(self.cache_dir, name))
+        if paths:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, _remove_files, paths)
+
+
+def _read_file(path):
+    """Return the contents of a cached file, marking it as recently used."""
+    with open(path, "rb") as file:
+        data = file.read()
+    os.utime(path)
+    return data
+
+
+def _write_file(path, data):
+    """Write a cache file atomically."""
+    with open(path + ".tmp", "wb") as file:
+        file.write(data)
+    os.replace(path + ".tmp", path)
+
+
+def _remove_files(paths):
+    """Delete evicted cache files."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError as err:
+            _LOGGER.debug("Could not evict %s [%s]", path, err)
@@ -0,0 +1,69 @@
+"""
+Background prefetching of the next track's album art.
+"""
+import asyncio
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+PREFETCH_DELAY = 5
+
+
+class ArtPrefetcher():
+    """Fetches, decodes and resizes upcoming album art while the current track plays."""
+
+    def __init__(self, processor, delay=PREFETCH_DELAY):
+        """Initialize the prefetcher."""
+        self.processor = processor
+        self.delay = delay
+        self.tasks = {}
+
+        self.scheduled = 0
+        self.prefetched = 0
+        self.already_cached = 0
+        self.failed = 0
+
+    @property
+    def stats(self):
+        """Return the prefetch counters."""
+        return {
+            "scheduled": self.scheduled,
+            "prefetched": self.prefetched,
+            "already_cached": self.already_cached,
+            "failed": self.failed,
+        }
+
+    def schedule(self, room, key, sizes, fetch):
+        """Prepare `sizes` for art `key` in the background using `fetch()` for the data.
+
+        Each room has at most one pending prefetch, replaced by newer requests.
+        """
+        current = self.tasks.get(room)
+        if current and current[0] == key and not current[1].done():
+            return
+        self.cancel(room)
+        self.scheduled += 1
+        self.tasks[room] = (key, asyncio.ensure_future(self._prefetch(key, tuple(sizes), fetch)))
+
+    def cancel(self, room):
+        """Abandon any pending prefetch for a room."""
+        current = self.tasks.pop(room, None)
+        if current and not current[1].done():
+            current[1].cancel()
+
+    async def _prefetch(self, key, sizes, fetch):
+        """Wait for the current redraw to settle, then warm the caches."""
+        # Stay out of the way of the redraw which triggered this
+        await asyncio.sleep(self.delay)
+
+        if self.processor.cached(key, sizes):
+            self.already_cached += 1
+            return
+
+        data = await fetch()
+        if not data or await self.processor.prepare(data, sizes, key) is None:
+            self.failed += 1
+            return
+
+        self.prefetched += 1
+        _LOGGER.debug("Prefetched next album art: %s", key)
@@ -4,12 +4,17 @@ Removes nonsense like "Remastered" and "Live at".
 modified from original at https://github.com/hankhank10/demaster
 """
 
+import asyncio
+from collections import OrderedDict
 import logging
 import re
 
 import aiohttp
 
+from json_store import JsonStore
+
 API_URL = "http://demaster.hankapi.com/demaster"
+DEFAULT_CACHE_ITEMS = 1000
 OFFLINE_PATTERN = re.compile(
     r"(\s(\(|-\s+))((199\d|20[0-2]\d)\s+)?(Remast|Live|Mono|From|Feat|Original|Motion|Deluxe).*", re.IGNORECASE
 )
@@ -17,6 +22,72 @@ OFFLINE_PATTERN = re.compile(
 _LOGGER = logging.getLogger(__name__)
 
 
+class DemasterCache():
+    """Bounded LRU of demastered names with optional persistence."""
+
+    def __init__(self, max_items=DEFAULT_CACHE_ITEMS, path=None):
+        """Initialize the cache, loading persisted names from `path` if given."""
+        self.max_items = max_items
+        self._store = JsonStore(path)
+        self._names = OrderedDict()
+        self._pending = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+        for full_name, short_name in self._store.load().items():
+            self._remember(full_name, short_name)
+
+    @property
+    def stats(self):
+        """Return the hit/miss counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_requests": self.shared,
+            "items": len(self._names),
+        }
+
+    def _remember(self, full_song_name, short_name):
+        """Store a mapping, evicting the least recently used entries."""
+        self._names[full_song_name] = short_name
+        self._names.move_to_end(full_song_name)
+        while len(self._names) > self.max_items:
+            self._names.popitem(last=False)
+
+    def flush(self):
+        """Save any names not yet persisted."""
+        self._store.flush()
+
+    async def get(self, full_song_name, fetch):
+        """Return the short name, awaiting `fetch(full_song_name)` only once per name."""
+        short_name = self._names.get(full_song_name)
+        if short_name is not None:
+            self._names.move_to_end(full_song_name)
+            self.hits += 1
+            return short_name
+
+        task = self._pending.get(full_song_name)
+        if task:
+            self.shared += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        task = asyncio.ensure_future(fetch(full_song_name))
+        self._pending[full_song_name] = task
+        try:
+            short_name = await asyncio.shield(task)
+        finally:
+            self._pending.pop(full_song_name, None)
+
+        self._remember(full_song_name, short_name)
+        # Demastering an already short name should be a no-op, so skip the lookup next time
+        self._remember(short_name, short_name)
+        self._store.save_later(dict(self._names))
+        return short_name
+
+
 def strip_name_offline(full_song_name):
     """Use an offline regex to shorten the track name."""
     match = OFFLINE_PATTERN.search(full_song_name)
@@ -62,12 +133,14 @@ async def strip_name_api(session, full_song_name):
     return short_name
 
 
-async def strip_name(full_song_name, session=None, offline=False):
+async def strip_name(full_song_name, session=None, offline=False, cache=None):
     """Main entry point."""
     if offline:
         return strip_name_offline(full_song_name)
 
     try:
+        if cache:
+            return await cache.get(full_song_name, lambda name: strip_name_api(session, name))
         return await strip_name_api(session, full_song_name)
     except ConnectionError:
         _LOGGER.debug("Online API failed, returning offline version")
@@ -0,0 +1,377 @@
+"""
+Benchmarks for the album art and rendering pipeline.
+
+Usage: python3 benchmark.py decode <directory of album art images>
+       python3 benchmark.py polling
+       python3 benchmark.py radio [--corpus radio_titles.json]
+       python3 benchmark.py layout
+       python3 benchmark.py render [--output DIR] [--compare DIR] [--framebuffer FILE]
+"""
+import argparse
+import asyncio
+from io import BytesIO
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+from PIL import Image, ImageChops
+
+import display_layout
+from framebuffer_display import FramebufferDisplay, pack_pixels
+from headless_display import HeadlessDisplay
+import image_processing
+from polling_policy import AdaptivePollingPolicy, FixedPollingPolicy
+from radio_normalizer import RadioNormalizer
+from track_state import TrackState
+
+SIZES = (720, 620)
+
+
+def load_corpus(directory):
+    """Return the raw bytes of every image file in a directory."""
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as file:
+                corpus.append((name, file.read()))
+    return corpus
+
+
+def decoded_pixels(data, draft):
+    """Return the number of pixels the decoder materializes for the image."""
+    with Image.open(BytesIO(data)) as image:
+        if draft:
+            image.draft("RGB", (max(SIZES), max(SIZES)))
+        return image.size[0] * image.size[1]
+
+
+def bench_decode(args):
+    """Compare full decodes with decodes at the target size."""
+    corpus = load_corpus(args.directory)
+    if not corpus:
+        print(f"No images found in {args.directory}")
+        return 1
+
+    for draft in (False, True):
+        pixels = 0
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, data in corpus:
+                image_processing.prepare_image(data, SIZES, draft=draft)
+        elapsed = time.perf_counter() - start
+        peak = 0
+        for _, data in corpus:
+            count = decoded_pixels(data, draft)
+            pixels += count
+            peak = max(peak, count)
+        per_image = elapsed / (args.repeat * len(corpus)) * 1000
+        print(f"{'draft' if draft else 'full ':5}: {per_image:7.1f} ms/image, "
+              f"{pixels * 3 / len(corpus) / 1e6:6.1f} MB avg bitmap, {peak * 3 / 1e6:6.1f} MB peak bitmap")
+    return 0
+
+
+def listening_session():
+    """Return a simulated day as a list of (start, end, state, duration) segments."""
+    segments = []
+    now = 0
+
+    def add(length, state, duration=0):
+        nonlocal now
+        # Changes never line up neatly with a poll in practice
+        length += 0.37
+        segments.append((now, now + length, state, duration))
+        now += length
+
+    add(3 * 3600, "STOPPED")
+    for duration in (213, 187, 245, 301, 198, 176, 264, 222):
+        add(duration, "PLAYING", duration)
+    add(1800, "PAUSED_PLAYBACK")
+    for duration in (235, 260, 140):
+        add(duration, "PLAYING", duration)
+    add(5 * 3600, "STOPPED")
+    return segments
+
+
+def simulate_polling(policy, segments):
+    """Return (polls, seconds to notice each track change, seconds to notice other changes)."""
+    polls = 0
+    track_latencies = []
+    other_latencies = []
+    now = 0
+    noticed = -1
+    end = segments[-1][1]
+    while now < end:
+        index = next(i for i, segment in enumerate(segments) if segment[0] <= now < segment[1])
+        start, _, state, duration = segments[index]
+        polls += 1
+        if index != noticed:
+            if index and state == segments[index - 1][2] == "PLAYING":
+                track_latencies.append(now - start)
+            elif index:
+                other_latencies.append(now - start)
+            noticed = index
+        sonos_data = SimpleNamespace(status=state, duration=duration, elapsed=int(now - start))
+        now += policy.next_interval(sonos_data)
+    return polls, track_latencies, other_latencies
+
+
+def bench_polling(args):
+    """Compare request volume and change detection latency of polling policies.
+
+    Fails if the adaptive policy doesn't poll less or notices track changes later than fixed polling.
+    """
+    segments = listening_session()
+    results = {}
+    for name, policy in (("fixed", FixedPollingPolicy(1)), ("adaptive", AdaptivePollingPolicy())):
+        polls, track_latencies, other_latencies = simulate_polling(policy, segments)
+        results[name] = (polls, sum(track_latencies) / len(track_latencies), max(track_latencies))
+        print(f"{name:8}: {polls:6} polls, "
+              f"track change noticed after {results[name][1]:4.2f}s mean / {results[name][2]:4.2f}s max, "
+              f"play/pause/stop after {sum(other_latencies) / len(other_latencies):4.2f}s mean / {max(other_latencies):5.2f}s max")
+
+    fixed_polls, fixed_mean, fixed_max = results["fixed"]
+    adaptive_polls, adaptive_mean, adaptive_max = results["adaptive"]
+    failures = 0
+    if adaptive_polls >= fixed_polls:
+        failures += 1
+        print(f"FAIL adaptive polling made {adaptive_polls} polls, fixed made {fixed_polls}")
+    if adaptive_mean > fixed_mean or adaptive_max > fixed_max:
+        failures += 1
+        print("FAIL adaptive polling noticed track changes later than fixed polling")
+    return 1 if failures else 0
+
+
+def legacy_radio_split(title, station, uri):
+    """The separator scanning radio title split which RadioNormalizer replaced."""
+    if title.count("~") : c = "~"
+    elif title.count("˗") : c = "˗"
+    elif title.count("*") : c = "*"
+    elif title.count("|") : c = "|"
+    elif title.count(" - ") : c = " - "
+    elif title.count(" / ") : c = " / "
+    else : return None
+
+    splitstr = title.casefold().split(c)
+    SplitStr = title.split(c)
+    if title.startswith("BR P|TYPE=SNG|") :
+        if title == "BR P|TYPE=SNG|TITLE |ARTIST |ALBUM" :
+            return "", ("BBC " + station) if "bbc_radio" in uri else station, ""
+        album = ' '.join(word[0].upper() + word[1:] for word in splitstr[2].split()) if c == "~" else ""
+        return SplitStr[3][7:], SplitStr[2][6:], album
+    artist = ' '.join(word[0].upper() + word[1:] for word in splitstr[0].split())
+    trackname = ' '.join(word[0].upper() + word[1:] for word in splitstr[1].split())
+    album = ' '.join(word[0].upper() + word[1:] for word in splitstr[2].split()) if c == "~" else ""
+    return artist, trackname, album
+
+
+def bench_radio(args):
+    """Check the radio title normalizer against its golden corpus and time it."""
+    with open(args.corpus, encoding="utf-8") as file:
+        corpus = json.load(file)
+    normalizer = RadioNormalizer()
+
+    failures = 0
+    for entry in corpus:
+        expected = tuple(entry["expected"]) if entry["expected"] else None
+        result = normalizer.normalize(entry["title"], entry["station"], entry["uri"])
+        if result != expected:
+            failures += 1
+            print(f"MISMATCH {entry['title']!r}: expected {expected}, got {result}")
+        try:
+            legacy = legacy_radio_split(entry["title"], entry["station"], entry["uri"])
+        except IndexError:
+            legacy = "IndexError"
+        if legacy != result:
+            print(f"changed  {entry['title']!r}: legacy {legacy}, now {result}")
+    print(f"{len(corpus) - failures}/{len(corpus)} titles match the corpus")
+
+    def safe_legacy(*entry):
+        try:
+            return legacy_radio_split(*entry)
+        except IndexError:
+            return None
+
+    entries = [(entry["title"], entry["station"], entry["uri"]) for entry in corpus]
+    for name, func in (("legacy", safe_legacy), ("table", normalizer.normalize)):
+        # Best of several runs, as the slower ones measure other load on the machine
+        runs = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                for entry in entries:
+                    func(*entry)
+            runs.append(time.perf_counter() - start)
+        print(f"{name:8}: {min(runs) / (args.repeat * len(entries)) * 1e6:5.2f} us per title")
+    return 1 if failures else 0
+
+
+def legacy_layout(trackname, detail_text, show_artist_and_album):
+    """The thumbnail and font size ladder which display_layout replaced."""
+    if show_artist_and_album:
+        if len(trackname) > 27:
+            thumb_size = 565 if len(detail_text) > 54 else 590
+            track_font_size = 27 if detail_text == "" else 22
+        else:
+            thumb_size = 600 if len(detail_text) > 54 else 620
+            if detail_text == "":
+                track_font_size = 37
+                thumb_size = thumb_size + 20
+            else:
+                track_font_size = 27
+        if len(trackname) > 27 and len(trackname) < 34:
+            thumb_size = thumb_size + 40
+    else:
+        if len(trackname) > 22:
+            thumb_size = 610
+            track_font_size = 27
+        else:
+            thumb_size = 640
+            track_font_size = 37
+        if len(trackname) > 22 and len(trackname) < 35:
+            thumb_size = thumb_size + 40
+    return thumb_size, track_font_size
+
+
+def bench_layout(args):
+    """Check the layout engine against the old ladder and time layouts and font creation."""
+    cases = [("x" * track, "y" * detail, flag)
+             for track in range(0, 80) for detail in range(0, 120, 3) for flag in (True, False)]
+    mismatches = 0
+    for case in cases:
+        layout = display_layout.get_layout(*case)
+        if (layout.thumb_size, layout.track_font_size) != legacy_layout(*case):
+            mismatches += 1
+            print(f"MISMATCH lengths {len(case[0])}/{len(case[1])} artist_and_album={case[2]}")
+    print(f"{len(cases) - mismatches}/{len(cases)} layouts match the old sizing")
+
+    for name, func in (("legacy", legacy_layout), ("cached", display_layout.get_layout)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for case in cases:
+                func(*case)
+        elapsed = time.perf_counter() - start
+        print(f"{name:8}: {elapsed / (args.repeat * len(cases)) * 1e6:5.2f} us per layout")
+
+    import tkinter as tk
+    from tkinter import font as tkFont
+    try:
+        root = tk.Tk()
+    except tk.TclError as err:
+        print(f"Skipping font creation, no display available [{err}]")
+        return 1 if mismatches else 0
+
+    fonts = {size: tkFont.Font(family="consolas", size=size) for size in display_layout.TRACK_FONT_SIZES}
+    start = time.perf_counter()
+    for size in display_layout.TRACK_FONT_SIZES * 100:
+        tkFont.Font(family="consolas", size=size).measure("Track")
+    created = (time.perf_counter() - start) / 300
+    start = time.perf_counter()
+    for size in display_layout.TRACK_FONT_SIZES * 100:
+        fonts[size].measure("Track")
+    reused = (time.perf_counter() - start) / 300
+    print(f"font    : {created * 1e6:7.1f} us created per update, {reused * 1e6:7.1f} us reused")
+    root.destroy()
+    return 1 if mismatches else 0
+
+
+RENDER_STATES = {
+    "short": TrackState(status="PLAYING", trackname="Yellow", artist="Coldplay", album="Parachutes", volume=20),
+    "long": TrackState(status="PLAYING", trackname="Sweet Child O' Mine (Remastered 2003 Edition)",
+                       artist="Guns N' Roses", album="Appetite For Destruction", volume=35, shuffle=True),
+    "radio": TrackState(status="PLAYING", type="radio", station="BBC Radio 6 Music", volume=10),
+}
+
+
+def sample_art(size):
+    """Return a deterministic album art stand-in."""
+    gradient = Image.linear_gradient("L").resize((size, size))
+    return Image.merge("RGB", (gradient, gradient.rotate(90), gradient.rotate(180)))
+
+
+def bench_render(args):
+    """Render sample frames with the headless backend, optionally saving or comparing them."""
+    loop = asyncio.new_event_loop()
+    code_image = Image.new("RGB", (160, 40), "#368A7D")
+    differences = 0
+    for overlay_text in (False, True):
+        if args.framebuffer:
+            display = FramebufferDisplay(loop, True, True, None, overlay_text, True, True, args.framebuffer, args.format)
+        else:
+            display = HeadlessDisplay(loop, True, True, None, overlay_text, True, True)
+        for name, state in RENDER_STATES.items():
+            art = sample_art(display.SCREEN_W)
+            images = {size: art.resize((size, size)) for size in display.art_sizes(state)}
+            for _ in range(args.repeat):
+                display.update(code_image, images, state)
+            display.update_play_state(state.replace(volume=state.volume + 1))
+
+            frame_name = f"{name}{'-overlay' if overlay_text else ''}.png"
+            if args.output:
+                os.makedirs(args.output, exist_ok=True)
+                display.frame.save(os.path.join(args.output, frame_name))
+            if args.compare:
+                with Image.open(os.path.join(args.compare, frame_name)) as expected:
+                    red, green, blue = ImageChops.difference(display.frame, expected.convert("RGB")).split()
+                # Count pixels where any channel differs
+                changed_channels = ImageChops.lighter(ImageChops.lighter(red, green), blue)
+                changed = changed_channels.width * changed_channels.height - changed_channels.histogram()[0]
+                if changed:
+                    differences += 1
+                    print(f"DIFFERS  {frame_name}: {changed} pixels")
+        stats = display.stats
+        print(f"overlay_text={overlay_text!s:5}: {stats['mean_render_ms']:6.2f} ms mean / {stats['max_render_ms']:6.2f} ms max per frame over {stats['frames']} frames, "
+              f"{stats['full_renders']} full / {stats['partial_renders']} partial / {stats['skipped_renders']} skipped renders")
+        if args.framebuffer:
+            written = bytes(display.buffer[:display.stride * display.fb_height])
+            expected = pack_pixels(display.frame, display.pixel_format)
+            if written != expected:
+                differences += 1
+                print("DIFFERS  framebuffer contents do not match the last frame")
+            print(f"framebuffer: {stats['writes']} writes, {stats['skipped_writes']} skipped, "
+                  f"{stats['bytes_written'] / stats['writes'] / 1024:.0f} KiB per write")
+            display.cleanup()
+    loop.close()
+    return 1 if differences else 0
+
+
+def main():
+    """Parse arguments and run the chosen benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    decode = subparsers.add_parser("decode", help="album art decode and resize")
+    decode.add_argument("directory", help="directory of album art images")
+    decode.add_argument("--repeat", type=int, default=3)
+    decode.set_defaults(func=bench_decode)
+
+    polling = subparsers.add_parser("polling", help="simulated polling policies over a day")
+    polling.set_defaults(func=bench_polling)
+
+    radio = subparsers.add_parser("radio", help="radio title normalizer against its golden corpus")
+    radio.add_argument("--corpus", default=os.path.join(sys.path[0], "radio_titles.json"))
+    radio.add_argument("--repeat", type=int, default=5000)
+    radio.add_argument("--runs", type=int, default=5)
+    radio.set_defaults(func=bench_radio)
+
+    layout = subparsers.add_parser("layout", help="detail view layout and track font reuse")
+    layout.add_argument("--repeat", type=int, default=200)
+    layout.set_defaults(func=bench_layout)
+
+    render = subparsers.add_parser("render", help="headless frame composition")
+    render.add_argument("--repeat", type=int, default=20)
+    render.add_argument("--output", help="directory to save the rendered frames to")
+    render.add_argument("--compare", help="directory of previously saved frames to compare against")
+    render.add_argument("--framebuffer", help="file or device to also write the frames to")
+    render.add_argument("--format", help="framebuffer pixel format, default BGRX for files")
+    render.set_defaults(func=bench_render)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    Image.MAX_IMAGE_PIXELS = None
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+Render backend independent part of the display, shared by the Tk and headless implementations.
+"""
+import logging
+import time
+
+from display_layout import get_layout
+from hyperpixel_backlight import Backlight
+
+_LOGGER = logging.getLogger(__name__)
+
+ALBUM_VIEW = "album"
+DETAIL_VIEW = "detail"
+
+# Parts of the display which are rendered separately
+ART = "art"
+TRACK = "track"
+DETAIL = "detail"
+PLAY_STATE = "play_state"
+SPOTIFY_CODE = "spotify_code"
+PARTS = (ART, TRACK, DETAIL, PLAY_STATE, SPOTIFY_CODE)
+
+
+def _same(shown, new):
+    """Return True if two content keys match, comparing images by identity."""
+    if isinstance(shown, tuple) and isinstance(new, tuple):
+        return len(shown) == len(new) and all(_same(a, b) for a, b in zip(shown, new))
+    if shown is None or isinstance(shown, (str, int, float)):
+        return shown == new
+    return shown is new
+
+
+class SonosDisplaySetupError(Exception):
+    """Error connecting to Sonos display."""
+
+
+class DisplayBase():
+    """Decides what to show and when, leaving the drawing to a render backend.
+
+    Backends implement `_present`, `_blank`, `_render` and `_render_play_state`.
+    Only the parts whose content differs from what is on screen are rendered.
+    """
+
+    SCREEN_W = 720
+    SCREEN_H = 720
+
+    def __init__(self, loop, show_details, show_artist_and_album, show_details_timeout, overlay_text, show_play_state, show_spotify_code, use_backlight=True):
+        """Initialize the display state."""
+        self.loop = loop
+        self.show_details = show_details
+        self.show_artist_and_album = show_artist_and_album
+        self.show_details_timeout = show_details_timeout
+        self.overlay_text = overlay_text
+        self.show_play_state = show_play_state
+        self.show_spotify_code = show_spotify_code
+
+        self.view = DETAIL_VIEW
+        self.timeout_future = None
+        self.is_showing = False
+
+        self.content = {}
+        self._needs_present = True
+
+        self.frames = 0
+        self.render_time = 0
+        self.max_render_time = 0
+        self.full_renders = 0
+        self.partial_renders = 0
+        self.skipped_renders = 0
+
+        self.backlight = Backlight() if use_backlight else None
+
+    @property
+    def stats(self):
+        """Return the render counters and time spent rendering frames."""
+        return {
+            "full_renders": self.full_renders,
+            "partial_renders": self.partial_renders,
+            "skipped_renders": self.skipped_renders,
+            "frames": self.frames,
+            "mean_render_ms": round(self.render_time / self.frames * 1000, 2) if self.frames else 0,
+            "max_render_ms": round(self.max_render_time * 1000, 2),
+        }
+
+    def _present(self):
+        """Make the current view visible."""
+        raise NotImplementedError
+
+    def _blank(self):
+        """Blank the screen."""
+        raise NotImplementedError
+
+    def _render(self, changes, code_image, images, display_trackname, detail_text, play_state_text, layout):
+        """Draw the `changes` parts of both views."""
+        raise NotImplementedError
+
+    def _render_play_state(self, play_state_text):
+        """Draw only the play state line."""
+        raise NotImplementedError
+
+    def _set_backlight(self, power):
+        """Switch the backlight if there is one."""
+        if self.backlight:
+            self.backlight.set_power(power)
+
+    def show_album(self, show_details=None, detail_timeout=None):
+        """Show album with optional detail display and timeout."""
+        def handle_timeout():
+            self.timeout_future = None
+            self.show_album(show_details=False)
+
+        previous_view = self.view
+        if show_details is None and detail_timeout is None:
+            pass
+        elif show_details:
+            self.view = DETAIL_VIEW
+            if detail_timeout:
+                if self.timeout_future:
+                    self.timeout_future.cancel()
+                self.timeout_future = self.loop.call_later(detail_timeout, handle_timeout)
+        else:
+            self.view = ALBUM_VIEW
+
+        if self._needs_present or not self.is_showing or self.view != previous_view:
+            self._present()
+            self._needs_present = False
+        self.is_showing = True
+        self._set_backlight(True)
+
+    def hide_album(self):
+        """Hide album if showing."""
+        if self.timeout_future:
+            self.timeout_future.cancel()
+            self.timeout_future = None
+            self.show_album(show_details=False)
+
+        self.is_showing = False
+        self._set_backlight(False)
+        self._blank()
+        # Blanking removes the Spotify Code
+        self.content.pop(SPOTIFY_CODE, None)
+
+    @staticmethod
+    def _play_state_text(state):
+        """Return the volume, shuffle, repeat and crossfade summary."""
+        play_state_volume = state.volume or None
+        play_state_shuffle = state.shuffle or None
+        play_state_repeat = state.repeat or None
+        play_state_crossfade = state.crossfade or None
+
+        play_state_volume_text = "Volume: " + str(play_state_volume)
+
+        play_state_shuffle_text = "Shuffle: " + str(play_state_shuffle).capitalize()
+
+        play_state_repeat_text = "Repeat: " + str(play_state_repeat).capitalize()
+
+        play_state_crossfade_text = "Crossfade: " + str(play_state_crossfade).capitalize()
+
+        return " • ".join(filter(None, [play_state_volume_text, play_state_shuffle_text, play_state_repeat_text, play_state_crossfade_text]))
+
+    def update_play_state(self, state):
+        """Refresh only the play state line, without touching images or layout."""
+        if not self.show_play_state or not self.content:
+            # The first full render draws the play state
+            return
+        play_state_text = self._play_state_text(state)
+        if play_state_text == self.content.get(PLAY_STATE):
+            self.skipped_renders += 1
+            return
+        self.content[PLAY_STATE] = play_state_text
+        self.partial_renders += 1
+        self._render_play_state(play_state_text)
+
+    def _layout(self, state):
+        """Return the text and `Layout` for the data."""
+        display_trackname = state.trackname or state.station
+
+        detail_text = ""
+        play_state_text = ""
+
+        if self.show_artist_and_album:
+            detail_prefix = None
+            detail_suffix = state.album or None
+
+            if state.artist != display_trackname:
+                detail_prefix = state.artist
+
+            detail_text = " • ".join(filter(None, [detail_prefix, detail_suffix]))
+
+        if self.show_play_state:
+            play_state_text = self._play_state_text(state)
+
+        layout = get_layout(display_trackname, detail_text, self.show_artist_and_album)
+        return display_trackname, detail_text, play_state_text, layout
+
+    def art_sizes(self, state):
+        """Return the square image sizes `update` needs for the data."""
+        _, _, _, layout = self._layout(state)
+        if self.overlay_text:
+            return (self.SCREEN_W,)
+        return (self.SCREEN_W, layout.thumb_size)
+
+    def update(self, code_image, images, state):
+        """Update displayed image and text from images prepared by `art_sizes`."""
+        start = time.perf_counter()
+        display_trackname, detail_text, play_state_text, layout = self._layout(state)
+        content = {
+            ART: tuple(sorted(images.items(), key=lambda item: item[0])),
+            TRACK: (display_trackname, layout.track_font_size, layout.track_y),
+            DETAIL: detail_text,
+            PLAY_STATE: play_state_text,
+            SPOTIFY_CODE: (code_image, detail_text == ""),
+        }
+        changes = {part for part in PARTS if part not in self.content or not _same(self.content[part], content[part])}
+
+        if not changes:
+            self.skipped_renders += 1
+            self.show_album(self.show_details, self.show_details_timeout)
+            return
+        if len(changes) == len(PARTS):
+            self.full_renders += 1
+        else:
+            self.partial_renders += 1
+        self._render(changes, code_image, images, display_trackname, detail_text, play_state_text, layout)
+        self.content = content
+        self._needs_present = True
+        self.show_album(self.show_details, self.show_details_timeout)
+
+        elapsed = time.perf_counter() - start
+        self.frames += 1
+        self.render_time += elapsed
+        self.max_render_time = max(self.max_render_time, elapsed)
+
+    def cleanup(self):
+        """Run cleanup actions."""
+        if self.backlight:
+            self.backlight.cleanup()
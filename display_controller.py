@@ -6,32 +6,25 @@ from tkinter import Y, font as tkFont
 
 from PIL import ImageTk
 
-from hyperpixel_backlight import Backlight
+from display_base import ART, DETAIL, DETAIL_VIEW, PLAY_STATE, SPOTIFY_CODE, TRACK, DisplayBase, SonosDisplaySetupError
+from display_layout import TRACK_FONT_SIZES
+from tk_event_pump import FRAME_RATE, TkEventPump
 
 _LOGGER = logging.getLogger(__name__)
 
-class SonosDisplaySetupError(Exception):
-    """Error connecting to Sonos display."""
+class DisplayController(DisplayBase):  # pylint: disable=too-many-instance-attributes
+    """Tk render backend handling the display hardware and GUI interface."""
 
-class DisplayController:  # pylint: disable=too-many-instance-attributes
-    """Controller to handle the display hardware and GUI interface."""
+    def __init__(self, loop, show_details, show_artist_and_album, show_details_timeout, overlay_text, show_play_state, show_spotify_code, screen_name=None, frame_rate=FRAME_RATE):
+        """Initialize the display controller, optionally on a specific X screen such as ":0.1".
 
-    def __init__(self, loop, show_details, show_artist_and_album, show_details_timeout, overlay_text, show_play_state, show_spotify_code):
-        """Initialize the display controller."""
+        Tk events are processed `frame_rate` times a second, display changes are drawn on the next frame.
+        """
+        super().__init__(loop, show_details, show_artist_and_album, show_details_timeout, overlay_text, show_play_state, show_spotify_code)
 
-        self.SCREEN_W = 720
-        self.SCREEN_H = 720
         self.THUMB_W = 0
         self.THUMB_H = 0
 
-        self.loop = loop
-        self.show_details = show_details
-        self.show_artist_and_album = show_artist_and_album
-        self.show_details_timeout = show_details_timeout
-        self.overlay_text = overlay_text
-        self.show_play_state = show_play_state
-        self.show_spotify_code = show_spotify_code
-
         self.album_image = None
         self.thumb_image = None
         self.code_image = None
@@ -42,20 +35,16 @@ class DisplayController:  # pylint: disable=too-many-instance-attributes
         self.label_spotify_code_detail = None
         self.track_font = None
         self.detail_font = None
-        self.timeout_future = None
-        self.is_showing = False
-
-        self.backlight = Backlight()
 
         try:
-            self.root = tk.Tk()
+            self.root = tk.Tk(screenName=screen_name)
         except tk.TclError:
             self.root = None
 
         if not self.root:
             os.environ["DISPLAY"] = ":0"
             try:
-                self.root = tk.Tk()
+                self.root = tk.Tk(screenName=screen_name)
             except tk.TclError as error:
                 _LOGGER.error("Cannot access display: %s", error)
                 raise SonosDisplaySetupError
@@ -83,6 +72,8 @@ class DisplayController:  # pylint: disable=too-many-instance-attributes
 
         self.detail_font = tkFont.Font(family="consolas", size=14)
         self.play_state_font = tkFont.Font(family="consolas", size=14)
+        # Tk fonts are created once per size and reused for every track
+        self.track_fonts = {size: tkFont.Font(family="consolas", size=size) for size in TRACK_FONT_SIZES}
 
         self.label_albumart = tk.Label(
             self.album_frame,
@@ -153,210 +144,128 @@ class DisplayController:  # pylint: disable=too-many-instance-attributes
         self.root.attributes("-fullscreen", True)
         self.root.update()
 
-    def show_album(self, show_details=None, detail_timeout=None):
-        """Show album with optional detail display and timeout."""
-        def handle_timeout():
-            self.timeout_future = None
-            self.show_album(show_details=False)
+        self.pump = TkEventPump(loop, self.root, frame_rate)
+        self.pump.start()
+
+    @property
+    def stats(self):
+        """Return the render statistics and time spent in Tk."""
+        stats = super().stats
+        stats["tk"] = self.pump.stats
+        return stats
 
-        if show_details is None and detail_timeout is None:
-            self.curtain_frame.lower()
-        elif show_details:
+    def _present(self):
+        """Lift the current view above the other frames."""
+        if self.view == DETAIL_VIEW:
             self.detail_frame.lift()
-            if detail_timeout:
-                if self.timeout_future:
-                    self.timeout_future.cancel()
-                self.timeout_future = self.loop.call_later(detail_timeout, handle_timeout)
         else:
             self.album_frame.lift()
+        self.curtain_frame.lower()
+        self.pump.request_flush()
 
-        self.is_showing = True
-        self.root.update()
-        self.backlight.set_power(True)
-
-    def hide_album(self):
-        """Hide album if showing."""
-        if self.timeout_future:
-            self.timeout_future.cancel()
-            self.timeout_future = None
-            self.show_album(show_details=False)
-
-        self.is_showing = False
-        self.backlight.set_power(False)
+    def _blank(self):
+        """Lift the black curtain over both views."""
         self.curtain_frame.lift()
-        self.root.update()
+        self.pump.request_flush()
         self.label_spotify_code.destroy()
         self.label_spotify_code_detail.destroy()
 
-    def update(self, code_image, image, sonos_data):
-        """Update displayed image and text."""
-
-        def resize_image(image, length):
-            """Resizes the image, assumes square image."""
-            image = image.resize((length, length), ImageTk.Image.ANTIALIAS)
-            return ImageTk.PhotoImage(image)
-
-        if code_image != None:
-           code_image = ImageTk.PhotoImage(code_image)
-
-        display_trackname = sonos_data.trackname or sonos_data.station
-
-        detail_text = ""
-        play_state_text = ""
-
-        if self.show_artist_and_album:
-            detail_prefix = None
-            detail_suffix = sonos_data.album or None
-
-            if sonos_data.artist != display_trackname:
-                detail_prefix = sonos_data.artist
-
-            detail_text = " • ".join(filter(None, [detail_prefix, detail_suffix]))
-
-        if self.show_play_state:
-            play_state_volume = sonos_data.volume or None
-            play_state_shuffle = sonos_data.shuffle or None
-            play_state_repeat = sonos_data.repeat or None
-            play_state_crossfade = sonos_data.crossfade or None
-
-            play_state_volume_text = "Volume: " + str(play_state_volume)
-
-            play_state_shuffle_text = "Shuffle: " + str(play_state_shuffle).capitalize()
-
-            play_state_repeat_text = "Repeat: " + str(play_state_repeat).capitalize()
-
-            play_state_crossfade_text = "Crossfade: " + str(play_state_crossfade).capitalize()
-
-            play_state_text = " • ".join(filter(None, [play_state_volume_text, play_state_shuffle_text, play_state_repeat_text, play_state_crossfade_text]))
-
-        if self.show_artist_and_album:
-            if len(display_trackname) > 27:
-                if len(detail_text) > 54:
-                    self.THUMB_H = 565
-                    self.THUMB_W = 565
-                else:
-                    self.THUMB_H = 590
-                    self.THUMB_W = 590
-                if detail_text == "":
-                    self.track_font = tkFont.Font(family="consolas", size=27)
-                else:
-                    self.track_font = tkFont.Font(family="consolas", size=22)
+    def _render_play_state(self, play_state_text):
+        """Set the play state label."""
+        self.play_state_text.set(play_state_text)
+        self.pump.request_flush()
+
+    def _render(self, changes, code_image, images, display_trackname, detail_text, play_state_text, layout):
+        """Configure only the labels whose content changed."""
+        if ART in changes:
+            self.THUMB_H = self.THUMB_W = layout.thumb_size
+
+            # Store the images as attributes to preserve scope for Tk
+            self.album_image = ImageTk.PhotoImage(images[self.SCREEN_W])
+            if self.overlay_text:
+                self.thumb_image = self.album_image
+                self.label_albumart_detail.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
             else:
-                if len(detail_text) > 54:
-                    self.THUMB_H = 600
-                    self.THUMB_W = 600
-                else:
-                    self.THUMB_H = 620
-                    self.THUMB_W = 620
-                if detail_text == "":
-                    self.track_font = tkFont.Font(family="consolas", size=37)
-                    self.THUMB_H = self.THUMB_H + 20
-                    self.THUMB_W = self.THUMB_W + 20
-                else:
-                    self.track_font = tkFont.Font(family="consolas", size=27)
-
-            if len(display_trackname) > 27 and len(display_trackname) < 34:
-                self.THUMB_H = self.THUMB_H + 40
-                self.THUMB_W = self.THUMB_W + 40
-            
-        else:
-            if len(display_trackname) > 22:
-                self.THUMB_H = 610
-                self.THUMB_W = 610
-                self.track_font = tkFont.Font(family="consolas", size=27)
+                self.thumb_image = ImageTk.PhotoImage(images[self.THUMB_W])
+                self.label_albumart_detail.place(relx=0.5, y=layout.thumb_y, anchor=tk.CENTER)
+            self.label_albumart.configure(image=self.album_image)
+            self.label_albumart_detail.configure(image=self.thumb_image)
+
+        if TRACK in changes:
+            self.track_font = self.track_fonts[layout.track_font_size]
+            self.label_track.place(relx=0.5, y=layout.track_y, anchor=tk.N)
+            self.label_track.configure(font=self.track_font)
+            self.track_name.set(display_trackname)
+
+        if DETAIL in changes:
+            if detail_text == "" or not self.show_artist_and_album:
+                self.label_detail.destroy()
             else:
-                self.THUMB_H = 640
-                self.THUMB_W = 640
-                self.track_font = tkFont.Font(family="consolas", size=37)
-
-            if len(display_trackname) > 22 and len(display_trackname) < 35:
-                self.THUMB_H = self.THUMB_H + 40
-                self.THUMB_W = self.THUMB_W + 40
-
-        # Store the images as attributes to preserve scope for Tk
-        self.album_image = resize_image(image, self.SCREEN_W)
-        if self.overlay_text:
-            self.thumb_image = resize_image(image, self.SCREEN_W)
-            self.label_albumart_detail.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
-        else:
-            self.thumb_image = resize_image(image, self.THUMB_W)
-            self.label_albumart_detail.place(relx=0.5, y=self.THUMB_H / 2, anchor=tk.CENTER)
+                if self.label_detail.winfo_exists() == 0:
+                    self.label_detail = tk.Label(
+                        self.detail_frame,
+                        textvariable=self.detail_text,
+                        font=self.detail_font,
+                        fg="white",
+                        bg="black",
+                        wraplength=600,
+                        justify="center",
+                    )
+                self.label_detail.place(relx=0.5, y=self.SCREEN_H - 10, anchor=tk.S)
+                self.label_detail.configure(font=self.detail_font)
+            self.detail_text.set(detail_text)
+
+        if PLAY_STATE in changes:
+            if not self.show_play_state:
+                self.label_play_state.destroy()
+            else:
+                if self.label_play_state.winfo_exists() == 0:
+                    self.label_play_state = tk.Label(
+                        self.detail_frame,
+                        textvariable=self.play_state_text,
+                        font=self.play_state_font,
+                        fg="white",
+                        bg="black",
+                        wraplength=700,
+                        justify="center",
+                    )
+                self.label_play_state.place(relx=0.5, y= 10, anchor=tk.N)
+                self.label_play_state.configure(font=self.play_state_font)
+            self.play_state_text.set(play_state_text)
+
+        if SPOTIFY_CODE in changes:
+            if not self.show_spotify_code or code_image == None  or detail_text == "":
+                self.label_spotify_code.destroy()
+                self.label_spotify_code_detail.destroy()
+            else:
+                code_image = self.code_image = ImageTk.PhotoImage(code_image)
+                if self.label_spotify_code.winfo_exists() == 0:
+                    self.label_spotify_code = tk.Label(
+                        self.album_frame,
+                        image=None,
+                        borderwidth=0,
+                        highlightthickness=0,
+                        fg="white",
+                        bg="#368A7D",
+                    )
+                    self.label_spotify_code.place(relx=0.75, y=40, anchor=tk.N)
+                self.label_spotify_code.configure(image=code_image)
 
-        self.label_track.place(relx=0.5, y=self.THUMB_H + 10, anchor=tk.N)
+                if self.label_spotify_code_detail.winfo_exists() == 0:
+                    self.label_spotify_code_detail = tk.Label(
+                        self.detail_frame,
+                        image=None,
+                        borderwidth=0,
+                        highlightthickness=0,
+                        fg="white",
+                        bg="#368A7D",
+                    )
+                    self.label_spotify_code_detail.place(relx=0.75, y=40, anchor=tk.N)
+                self.label_spotify_code_detail.configure(image=code_image)
 
-        if detail_text == "" or not self.show_artist_and_album:
-            self.label_detail.destroy()
-        else:
-            if self.label_detail.winfo_exists() == 0:
-                self.label_detail = tk.Label(
-                    self.detail_frame,
-                    textvariable=self.detail_text,
-                    font=self.detail_font,
-                    fg="white",
-                    bg="black",
-                    wraplength=600,
-                    justify="center",
-                )
-            self.label_detail.place(relx=0.5, y=self.SCREEN_H - 10, anchor=tk.S)
-            self.label_detail.configure(font=self.detail_font)
-
-        if not self.show_play_state:
-            self.label_play_state.destroy()
-        else:
-            if self.label_play_state.winfo_exists() == 0:
-                self.label_play_state = tk.Label(
-                    self.detail_frame,
-                    textvariable=self.play_state_text,
-                    font=self.play_state_font,
-                    fg="white",
-                    bg="black",
-                    wraplength=700,
-                    justify="center",
-                )
-            self.label_play_state.place(relx=0.5, y= 10, anchor=tk.N)
-            self.label_play_state.configure(font=self.play_state_font)
-
-        if not self.show_spotify_code or code_image == None  or detail_text == "":
-            self.label_spotify_code.destroy()
-            self.label_spotify_code_detail.destroy()
-        else:
-            if self.label_spotify_code.winfo_exists() == 0:
-                self.label_spotify_code = tk.Label(
-                    self.album_frame,
-                    image=None,
-                    borderwidth=0,
-                    highlightthickness=0,
-                    fg="white",
-                    bg="#368A7D",
-                )
-                self.label_spotify_code.place(relx=0.75, y=40, anchor=tk.N)
-            if code_image != None:
-                self.label_spotify_code.configure(image=code_image)
-                
-            if self.label_spotify_code_detail.winfo_exists() == 0:
-                self.label_spotify_code_detail = tk.Label(
-                    self.detail_frame,
-                    image=None,
-                    borderwidth=0,
-                    highlightthickness=0,
-                    fg="white",
-                    bg="#368A7D",
-                )
-                self.label_spotify_code_detail.place(relx=0.75, y=40, anchor=tk.N)
-            if code_image != None:
-                self.label_spotify_code_detail.configure(image=code_image) 
-
-        self.label_albumart.configure(image=self.album_image)
-        self.label_albumart_detail.configure(image=self.thumb_image)
-        self.label_track.configure(font=self.track_font)
-        self.track_name.set(display_trackname)
-        self.detail_text.set(detail_text)
-        self.play_state_text.set(play_state_text)
-        
-        self.root.update_idletasks()
-        self.show_album(self.show_details, self.show_details_timeout)
+        self.pump.request_flush()
 
     def cleanup(self):
-        """Run cleanup actions."""
-        self.backlight.cleanup()
-
+        """Stop processing Tk events and run cleanup actions."""
+        self.pump.stop()
+        super().cleanup()
@@ -0,0 +1,48 @@
+"""
+Layout of the detail view, kept free of Tk so it can be tested and benchmarked without a display.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+TRACK_FONT_SIZES = (22, 27, 37)
+
+# Track and detail text longer than this are laid out the same
+MAX_TRACK_LENGTH = 35
+MAX_DETAIL_LENGTH = 55
+
+Layout = namedtuple("Layout", ["thumb_size", "track_font_size", "thumb_y", "track_y"])
+
+
+@lru_cache(maxsize=None)
+def _layout(track_length, detail_length, show_artist_and_album):
+    """Return the layout for clamped text lengths."""
+    if show_artist_and_album:
+        long_detail = detail_length > 54
+        if track_length > 27:
+            thumb_size = 565 if long_detail else 590
+            track_font_size = 22 if detail_length else 27
+            if track_length < 34:
+                thumb_size += 40
+        elif detail_length:
+            thumb_size = 600 if long_detail else 620
+            track_font_size = 27
+        else:
+            thumb_size = 640
+            track_font_size = 37
+    elif track_length > 22:
+        thumb_size = 610 if track_length == MAX_TRACK_LENGTH else 650
+        track_font_size = 27
+    else:
+        thumb_size = 640
+        track_font_size = 37
+
+    return Layout(thumb_size, track_font_size, thumb_y=thumb_size / 2, track_y=thumb_size + 10)
+
+
+def get_layout(trackname, detail_text, show_artist_and_album):
+    """Return the cached thumbnail size, track font size and label positions for the text."""
+    return _layout(
+        min(len(trackname), MAX_TRACK_LENGTH),
+        min(len(detail_text), MAX_DETAIL_LENGTH),
+        bool(show_artist_and_album),
+    )
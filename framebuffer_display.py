@@ -0,0 +1,148 @@
+"""
+Framebuffer render backend which writes composed frames straight to `/dev/fb0`, bypassing X11 and Tk.
+"""
+import logging
+import mmap
+import os
+import stat
+
+from PIL import Image, ImageChops
+
+from display_base import SonosDisplaySetupError
+from headless_display import HeadlessDisplay
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_DEVICE = "/dev/fb0"
+
+# Bytes per pixel of the supported pixel formats, named after the byte order in memory
+PIXEL_FORMATS = {"BGRX": 4, "RGBX": 4, "BGR": 3, "RGB": 3, "RGB565": 2}
+FORMAT_FOR_DEPTH = {32: "BGRX", 24: "BGR", 16: "RGB565"}
+
+
+def framebuffer_geometry(device):
+    """Return (width, height, bits per pixel, stride) of a framebuffer device from sysfs, or None."""
+    sysfs = os.path.join("/sys/class/graphics", os.path.basename(device))
+    try:
+        with open(os.path.join(sysfs, "virtual_size")) as file:
+            width, height = (int(value) for value in file.read().split(","))
+        with open(os.path.join(sysfs, "bits_per_pixel")) as file:
+            depth = int(file.read())
+        with open(os.path.join(sysfs, "stride")) as file:
+            stride = int(file.read())
+    except (OSError, ValueError):
+        return None
+    return width, height, depth, stride
+
+
+def pack_pixels(image, pixel_format):
+    """Return the raw bytes of an RGB image in a framebuffer pixel format."""
+    if pixel_format != "RGB565":
+        return image.tobytes("raw", pixel_format)
+
+    # Little endian RGB565, built from two byte planes since the bits of each byte don't overlap
+    red, green, blue = image.split()
+    high = ImageChops.add(red.point(lambda value: value & 0xF8), green.point(lambda value: value >> 5))
+    low = ImageChops.add(green.point(lambda value: (value >> 2 & 0x07) << 5), blue.point(lambda value: value >> 3))
+    return Image.merge("LA", (low, high)).tobytes()
+
+
+class FramebufferDisplay(HeadlessDisplay):
+    """Writes the changed region of each composed frame to a memory mapped framebuffer.
+
+    Any file can stand in for the device, it is sized to hold a frame.
+    """
+
+    def __init__(self, loop, show_details, show_artist_and_album, show_details_timeout, overlay_text, show_play_state, show_spotify_code, device=DEFAULT_DEVICE, pixel_format=None):
+        """Initialize the framebuffer display, detecting the pixel format of real devices."""
+        super().__init__(loop, show_details, show_artist_and_album, show_details_timeout, overlay_text, show_play_state, show_spotify_code, use_backlight=True)
+
+        geometry = framebuffer_geometry(device)
+        if geometry:
+            self.fb_width, self.fb_height, depth, self.stride = geometry
+            pixel_format = pixel_format or FORMAT_FOR_DEPTH.get(depth)
+        else:
+            self.fb_width, self.fb_height = self.SCREEN_W, self.SCREEN_H
+            pixel_format = pixel_format or "BGRX"
+        if pixel_format not in PIXEL_FORMATS:
+            _LOGGER.error("Unsupported framebuffer pixel format: %s", pixel_format)
+            raise SonosDisplaySetupError
+        self.pixel_format = pixel_format
+        self.bytes_per_pixel = PIXEL_FORMATS[pixel_format]
+        if not geometry:
+            self.stride = self.fb_width * self.bytes_per_pixel
+
+        size = self.stride * self.fb_height
+        try:
+            self.fd = os.open(device, os.O_RDWR | os.O_CREAT)
+            if stat.S_ISREG(os.fstat(self.fd).st_mode) and os.fstat(self.fd).st_size < size:
+                os.ftruncate(self.fd, size)
+            self.buffer = mmap.mmap(self.fd, size)
+        except OSError as error:
+            _LOGGER.error("Cannot open framebuffer %s: %s", device, error)
+            raise SonosDisplaySetupError
+
+        _LOGGER.info("Writing %sx%s %s frames to %s", self.fb_width, self.fb_height, pixel_format, device)
+        self.shown = None
+
+        self.writes = 0
+        self.skipped_writes = 0
+        self.bytes_written = 0
+
+    @property
+    def stats(self):
+        """Return the render statistics and framebuffer write counters."""
+        stats = super().stats
+        stats.update({
+            "writes": self.writes,
+            "skipped_writes": self.skipped_writes,
+            "bytes_written": self.bytes_written,
+        })
+        return stats
+
+    def _present(self):
+        """Make the current view visible."""
+        super()._present()
+        self._flush()
+
+    def _blank(self):
+        """Make a black frame visible."""
+        super()._blank()
+        self._flush()
+
+    def _flush(self):
+        """Write the region of the frame which differs from what is on screen."""
+        frame = self.frame
+        if frame is self.shown:
+            self.skipped_writes += 1
+            return
+
+        if self.shown is None:
+            bbox = (0, 0, frame.width, frame.height)
+        else:
+            bbox = ImageChops.difference(self.shown, frame).getbbox()
+        self.shown = frame
+        if not bbox:
+            self.skipped_writes += 1
+            return
+
+        left, top, right, bottom = bbox
+        right = min(right, self.fb_width)
+        bottom = min(bottom, self.fb_height)
+        if left >= right or top >= bottom:
+            return
+
+        data = pack_pixels(frame.crop((left, top, right, bottom)), self.pixel_format)
+        row_length = (right - left) * self.bytes_per_pixel
+        for row, y in enumerate(range(top, bottom)):
+            offset = y * self.stride + left * self.bytes_per_pixel
+            self.buffer[offset:offset + row_length] = data[row * row_length:(row + 1) * row_length]
+
+        self.writes += 1
+        self.bytes_written += len(data)
+
+    def cleanup(self):
+        """Release the framebuffer."""
+        super().cleanup()
+        self.buffer.close()
+        os.close(self.fd)
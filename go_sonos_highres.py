@@ -5,19 +5,26 @@ it integrates with your local Sonos sytem to display what is currently playing
 import asyncio
 import logging
 import os
-import re
 import signal
 import subprocess
 import sys
-import time
-from io import BytesIO
 
-from aiohttp import ClientError, ClientSession
-from PIL import Image, ImageFile
+from aiohttp import ClientError, ClientSession, ClientTimeout
 
 import async_demaster
-from display_controller import DisplayController, SonosDisplaySetupError
+from art_prefetcher import ArtPrefetcher
+from album_art_cache import AlbumArtCache, DEFAULT_CACHE_DIR, DEFAULT_DISK_BUDGET_MB, DEFAULT_MEMORY_ITEMS, normalize_uri
+from display_base import SonosDisplaySetupError
+from image_processing import DEFAULT_VARIANT_ITEMS, ImageProcessor
+from loop_monitor import LoopMonitor
+from polling_policy import create_policy
+from room_monitor import COALESCE_WINDOW as WEBHOOK_COALESCE_WINDOW, RoomMonitor
+from sonos_topology import SonosTopology
 from sonos_user_data import SonosData
+import station_registry
+import spotify_lookup
+from spotify_lookup import DEFAULT_CACHE_TTL, DEFAULT_NEGATIVE_CACHE_TTL, SPOTIFY_CODE_URL, SpotifyLookup, SpotifySearchCache
+from track_state import PLAY_STATE_FIELDS
 from webhook_handler import SonosWebhook
 
 _LOGGER = logging.getLogger(__name__)
@@ -32,11 +39,7 @@ show_spotify_code = getattr(sonos_settings, "show_spotify_code", None)
 show_spotify_albumart = getattr(sonos_settings, "show_spotify_albumart", None)
 
 if show_spotify_code or show_spotify_albumart:
-    try:
-        import spotipy
-        from spotipy.oauth2 import SpotifyClientCredentials
-        spotify_import_success = True
-    except ImportError:
+    if spotify_lookup.spotipy is None:
         _LOGGER.error("ERROR: spotipy not found. Install spotipy with the command: pip install spotipy")
         sys.exit(1)
 
@@ -44,60 +47,291 @@ if show_spotify_code or show_spotify_albumart:
 # Global variables and setup
 POLLING_INTERVAL = 1
 WEBHOOK_INTERVAL = 60
+ART_FETCH_DEADLINE = getattr(sonos_settings, "art_fetch_deadline", 10)
+ART_FETCH_TIMEOUT = getattr(sonos_settings, "art_fetch_timeout", 5)
+ART_HEDGE_DELAY = getattr(sonos_settings, "art_hedge_delay", 1.5)
+
+art_cache = AlbumArtCache(
+    getattr(sonos_settings, "album_art_cache_dir", DEFAULT_CACHE_DIR),
+    getattr(sonos_settings, "album_art_cache_size_mb", DEFAULT_DISK_BUDGET_MB) * 1024 * 1024,
+    getattr(sonos_settings, "album_art_cache_memory_items", DEFAULT_MEMORY_ITEMS),
+)
+
+image_processor = ImageProcessor(
+    getattr(sonos_settings, "image_processing_pool", "thread") == "process",
+    variant_items=getattr(sonos_settings, "image_variant_cache_items", DEFAULT_VARIANT_ITEMS),
+)
+
+image_downloads = {}
+
+art_prefetcher = ArtPrefetcher(image_processor)
 
-ImageFile.LOAD_TRUNCATED_IMAGES = True
+spotify = None
+if show_spotify_code or show_spotify_albumart:
+    spotify_client_id = getattr(sonos_settings, "spotify_client_id", None)
+    spotify_client_secret = getattr(sonos_settings, "spotify_client_secret", None)
+    if spotify_client_id and spotify_client_secret:
+        spotify_cache = SpotifySearchCache(
+            getattr(sonos_settings, "spotify_cache_file", None),
+            getattr(sonos_settings, "spotify_cache_ttl", DEFAULT_CACHE_TTL),
+            getattr(sonos_settings, "spotify_cache_negative_ttl", DEFAULT_NEGATIVE_CACHE_TTL),
+        )
+        spotify = SpotifyLookup(spotify_client_id, spotify_client_secret, sonos_settings.spotify_market, spotify_cache)
+    else:
+        _LOGGER.warning("No Spotify API client ID or Secret in settings file, cannot search the Spotify API")
+
+demaster_cache = async_demaster.DemasterCache(
+    getattr(sonos_settings, "demaster_cache_items", async_demaster.DEFAULT_CACHE_ITEMS),
+    getattr(sonos_settings, "demaster_cache_file", None),
+)
 
 ###############################################################################
 # Functions
 
-async def get_image_data(session, url):
-    """Return image data from a URL if available."""
+async def get_image_data(session, url, cache=None):
+    """Return image data from a URL if available, checking the cache first."""
     if not url:
         return None
 
+    if cache:
+        data = await cache.get(url)
+        if data:
+            _LOGGER.debug("Album art cache hit: %s", url)
+            return data
+
+    # Rooms playing the same track share a single download
+    key = normalize_uri(url)
+    task = image_downloads.get(key)
+    if task is None:
+        task = asyncio.ensure_future(download_image_data(session, url, cache))
+        image_downloads[key] = task
+        task.add_done_callback(lambda _: image_downloads.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def download_image_data(session, url, cache=None):
+    """Download image data from a URL, adding it to the cache."""
     try:
-        async with session.get(url) as response:
+        async with session.get(url, timeout=ClientTimeout(total=ART_FETCH_TIMEOUT)) as response:
+            if response.status != 200:
+                _LOGGER.warning("Image request failed with status %s: %s", response.status, url)
+                return None
             content_type = response.headers.get('content-type')
             if content_type and not content_type.startswith('image/'):
                 _LOGGER.warning(
                     "Not a valid image type (%s): %s", content_type, url)
                 return None
-            return await response.read()
+            data = await response.read()
+            if cache:
+                await cache.put(url, data)
+            return data
     except ClientError as err:
         _LOGGER.warning("Problem connecting to %s [%s]", url, err)
+    except asyncio.TimeoutError:
+        _LOGGER.warning("Timed out after %ss loading %s", ART_FETCH_TIMEOUT, url)
     except Exception as err:
         _LOGGER.warning("Image failed to load: %s [%s]", url, err)
     return None
 
 
+async def fetch_art_images(session, url, sizes):
+    """Return display images for an album art URL, using the caches where possible."""
+    if not url:
+        return None
+
+    art_key = normalize_uri(url)
+    images = image_processor.cached(art_key, sizes)
+    if images is not None:
+        _LOGGER.debug("Using cached display images for %s", url)
+        return images
+
+    image_data = await get_image_data(session, url, art_cache)
+    if not image_data:
+        return None
+    return await image_processor.prepare(image_data, sizes, art_key)
+
+
+async def fetch_code_image(session, code_uri):
+    """Return the Spotify Code image for a Spotify URI."""
+    code_data = await get_image_data(session, SPOTIFY_CODE_URL + code_uri, art_cache)
+    if not code_data:
+        return None
+    return await image_processor.decode(code_data)
+
+
+def get_spotify_code_uri(state, track_uri):
+    """Return the Spotify URI to show as a Spotify Code."""
+    if state.uri.startswith('x-sonos-spotify:'):
+        return state.uri.replace('x-sonos-spotify:', '')
+    return track_uri
+
+
+async def hedged_fetch(primary, alternate, delay):
+    """Return the first usable result from two sources.
+
+    `primary` and `alternate` are coroutine functions. The alternate is only started
+    once the primary fails or has not answered within `delay` seconds, and the
+    slower source is cancelled once one succeeds.
+    """
+    primary_task = asyncio.ensure_future(primary())
+    tasks = {primary_task}
+    try:
+        await asyncio.wait(tasks, timeout=delay)
+        if not primary_task.done() or primary_task.exception() or primary_task.result() is None:
+            if alternate is None:
+                return await primary_task
+            if not primary_task.done():
+                _LOGGER.debug("Primary album art source slow, starting alternate")
+            tasks.add(asyncio.ensure_future(alternate()))
+
+        pending = tasks
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception():
+                    _LOGGER.warning("Problem fetching album art [%s]", task.exception())
+                elif task.result() is not None:
+                    if task is not primary_task:
+                        _LOGGER.debug("Alternate album art source answered first")
+                    return task.result()
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def acquire_art(session, state, art_sizes):
+    """Return (Spotify Code image, album art images) for the current track."""
+    search_task = None
+    if spotify and state.artist != "" and state.trackname != "":
+        search_task = asyncio.ensure_future(spotify.search_track(state.artist, state.trackname))
+    elif spotify:
+        _LOGGER.debug("Either artist and/or trackname was blank, skipped searching Spotify")
+
+    async def sonos_art():
+        return await fetch_art_images(session, state.image_uri, art_sizes)
+
+    async def spotify_art():
+        match = await asyncio.shield(search_task)
+        if not match:
+            return None
+        _LOGGER.debug("Spotify album art URI successfully obtained: %s", match[1])
+        return await fetch_art_images(session, match[1], art_sizes)
+
+    async def spotify_code():
+        match = await asyncio.shield(search_task)
+        if not match:
+            return None
+        spotify_code_uri = get_spotify_code_uri(state, match[0])
+        _LOGGER.debug("Spotify Code URI successfully obtained: %s", spotify_code_uri)
+        return await fetch_code_image(session, spotify_code_uri)
+
+    if search_task is None:
+        sources = (sonos_art, None)
+    elif show_spotify_albumart:
+        sources = (spotify_art, sonos_art)
+    else:
+        sources = (sonos_art, spotify_art)
+
+    fetches = {"album art": hedged_fetch(*sources, ART_HEDGE_DELAY)}
+    if show_spotify_code and search_task:
+        fetches["Spotify Code"] = spotify_code()
+
+    try:
+        results = await gather_with_deadline(fetches, ART_FETCH_DEADLINE)
+    finally:
+        if search_task:
+            search_task.cancel()
+
+    code_image = results.get("Spotify Code")
+    if show_spotify_code and search_task and code_image is None:
+        _LOGGER.info("Spotify Code not available")
+    return code_image, results["album art"]
+
+
+async def gather_with_deadline(coros, deadline):
+    """Run a dict of coroutines together and return their results by key.
+
+    Anything unfinished by the deadline is cancelled and, like failures, reported as None.
+    """
+    tasks = {key: asyncio.ensure_future(coro) for key, coro in coros.items()}
+    _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    for task in pending:
+        task.cancel()
+    if pending:
+        _LOGGER.warning("Album art fetch deadline of %ss exceeded", deadline)
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results = {}
+    for key, task in tasks.items():
+        if task.cancelled():
+            results[key] = None
+        elif task.exception():
+            _LOGGER.warning("Problem fetching %s [%s]", key, task.exception())
+            results[key] = None
+        else:
+            results[key] = task.result()
+    return results
+
+
+def prefetch_next_art(session, sonos_data, state, display):
+    """Warm the caches with the next track's album art at display sizes."""
+    if not sonos_data.next_image_uri or show_spotify_albumart:
+        # Spotify art is looked up per track, so the speaker's art may never be shown
+        return
+
+    # Estimate the layout of the next track to choose the thumbnail size
+    next_state = state.replace(
+        trackname=sonos_data.next_trackname,
+        artist=sonos_data.next_artist,
+        album=sonos_data.next_album,
+    )
+    if sonos_settings.demaster:
+        next_state = next_state.replace(
+            trackname=async_demaster.strip_name_offline(next_state.trackname),
+            album=async_demaster.strip_name_offline(next_state.album),
+        )
+
+    art_uri = sonos_data.next_image_uri
+    art_prefetcher.schedule(
+        sonos_data.room,
+        normalize_uri(art_uri),
+        display.art_sizes(next_state),
+        lambda: get_image_data(session, art_uri, art_cache),
+    )
+
+
+def station_logo(state):
+    """Return the path of a configured logo for the radio station playing, or None."""
+    if state.type != "radio":
+        return None
+    registry = station_registry.get_registry()
+    return registry.logo(state.station or registry.lookup(state.uri))
+
+
 async def redraw(session, sonos_data, display):
     """Redraw the screen with current data."""
     if sonos_data.status == "API error":
         return
 
-    pil_image = None
-    code_image = None
-    spotify_code_uri = None
-    spotify_albumart_uri = None
-    spotify_client_id = None
-    spotify_client_secret = None
-    spotify_auth_success = False 
+    # Work from one snapshot in case a webhook refreshes the data while this runs
+    state = sonos_data.state
 
     def should_sleep():
         """Determine if screen should be sleeping."""
-        if sonos_data.type == "line_in":
+        if state.type == "line_in":
             return getattr(sonos_settings, "sleep_on_linein", False)
-        if sonos_data.type == "TV":
+        if state.type == "TV":
             return getattr(sonos_settings, "sleep_on_tv", False)
 
     if should_sleep():
         if display.is_showing:
-            _LOGGER.debug("Input source is %s, sleeping", sonos_data.type)
+            _LOGGER.debug("Input source is %s, sleeping", state.type)
             display.hide_album()
         return
 
     # see if something is playing
-    if sonos_data.status == "PLAYING":
+    if state.status == "PLAYING":
         new_track_info = sonos_data.is_track_new()
         force_update = False
 
@@ -109,103 +343,46 @@ async def redraw(session, sonos_data, display):
                 display.show_album()
 
         # slim down the album and track names
-        if sonos_settings.demaster and sonos_data.type not in ["line_in", "TV"]:
+        if sonos_settings.demaster and state.type not in ["line_in", "TV"]:
             offline = not getattr(
                 sonos_settings, "demaster_query_cloud", False)
-            sonos_data.trackname = await async_demaster.strip_name(sonos_data.trackname, session, offline)
-            sonos_data.album = await async_demaster.strip_name(sonos_data.album, session, offline)
+            state = state.replace(
+                trackname=await async_demaster.strip_name(state.trackname, session, offline, demaster_cache),
+                album=await async_demaster.strip_name(state.album, session, offline, demaster_cache),
+            )
 
         if new_track_info or force_update:
             _LOGGER.debug("The new_track_info state is %s and force_update state is %s, resetting display with new information", new_track_info, force_update)
-
-            if sonos_data.artist != "" and sonos_data.trackname !="":
+            art_sizes = display.art_sizes(state)
+            logo = station_logo(state)
+            images = None
+            if logo:
+                code_image = None
+                images = await image_processor.prepare(logo, art_sizes, logo)
+            if images is None:
+                code_image, images = await acquire_art(session, state, art_sizes)
+
+            if images is None and state.type == "line_in":
+                images = await image_processor.prepare(sys.path[0] + "/line_in.png", art_sizes, "line_in.png")
+            elif images is None and state.type == "TV":
+                images = await image_processor.prepare(sys.path[0] + "/tv.png", art_sizes, "tv.png")
+
+            if images is None:
                 if show_spotify_code or show_spotify_albumart:
-                    spotify_client_id = getattr(sonos_settings, "spotify_client_id", None)
-                    spotify_client_secret = getattr(sonos_settings, "spotify_client_secret", None)
-
-                    if spotify_client_id and spotify_client_secret:
-                        client_credentials_manager = SpotifyClientCredentials(spotify_client_id, spotify_client_secret)
-                        try:
-                            spotify_auth_success = True
-                            spotify = spotipy.Spotify(client_credentials_manager=client_credentials_manager)
-                            _LOGGER.debug("Authorising Spotify developer account successful")
-                        except:
-                            spotify_auth_success = False
-                            _LOGGER.warning("Problem authorising Spotify developer account, please check your credentials in sonos_settings.py are correct")
-                    else:
-                        spotify_auth_success = False
-
-                if spotify_client_id and spotify_client_secret:
-                    if show_spotify_code or show_spotify_albumart and spotify_auth_success:
-                        spotify_code_path = "https://scannables.scdn.co/uri/plain/png/368A7D/white/320/"
-
-                        try:
-                            results = spotify.search(q="artist:" + re.sub("´|`|'|’", "", sonos_data.artist) + " track:" + re.sub("´|`|'|’", "", sonos_data.trackname), type="track", limit=1, market=sonos_settings.spotify_market)
-
-                            if results['tracks']['total'] != 0:
-                                results = results['tracks']['items'][0]  # Find top result
-                                uri = results['uri']
-                                spotify_albumart_uri = results['album']['images'][0]['url']
-                                _LOGGER.debug("Spotify album art URI successfully obtained: %s", spotify_albumart_uri)
-                                if sonos_data.uri.startswith('x-sonos-spotify:'):
-                                    spotify_code_uri = sonos_data.uri.replace('x-sonos-spotify:', '')
-                                else:                            
-                                    spotify_code_uri = uri
-                                _LOGGER.debug("Spotify Code URI successfully obtained: %s", spotify_code_uri)
-                            else:
-                                spotify_code_uri = None
-                                spotify_albumart_uri = None
-                        except:
-                            spotify_code_uri = None
-                            spotify_albumart_uri = None
-                            _LOGGER.warning("Problem searching Spotify, defaulting to Sonos system")
-
-                        if spotify_code_uri != None:
-                            spotify_code_url = "".join(filter(None, [spotify_code_path, spotify_code_uri]))
-                        else:
-                            spotify_code_url = None
-
-                        if spotify_code_url != None:
-                            code_data = await get_image_data(session, spotify_code_url)
-                            if code_data:
-                                code_image = Image.open(BytesIO(code_data))
-                            else:
-                                code_image = None
-                        else:
-                            code_image = None
-
-                        if code_image == None:
-                                _LOGGER.info("Spotify Code not available")
-                        if spotify_albumart_uri == None:
-                                _LOGGER.info("Spotify album art not available")
-                    else:
-                        code_image = None
+                    images = await image_processor.prepare(sys.path[0] + "/spotify_sonos.png", art_sizes, "spotify_sonos.png")
                 else:
-                    if show_spotify_code or show_spotify_albumart:
-                        _LOGGER.warning("No Spotify API client ID or Secret in settings file, cannot search the Spotify API")
-            else:
-                _LOGGER.debug("Either artist and/or trackname was blank, skipped searching Spotify")
-
-            if show_spotify_albumart and spotify_auth_success and spotify_albumart_uri != None:
-                image_data = await get_image_data(session, spotify_albumart_uri)
-            else:
-                image_data = await get_image_data(session, sonos_data.image_uri)
-            
-            if image_data:
-                pil_image = Image.open(BytesIO(image_data))
-            elif sonos_data.type == "line_in":
-                pil_image = Image.open(sys.path[0] + "/line_in.png")
-            elif sonos_data.type == "TV":
-                pil_image = Image.open(sys.path[0] + "/tv.png")
-
-            if pil_image is None:
-                if show_spotify_code or show_spotify_albumart:
-                    pil_image = Image.open(sys.path[0] + "/spotify_sonos.png")
-                else:
-                    pil_image = Image.open(sys.path[0] + "/sonos.png")
+                    images = await image_processor.prepare(sys.path[0] + "/sonos.png", art_sizes, "sonos.png")
                 _LOGGER.warning("Image not available, using default")
 
-            display.update(code_image, pil_image, sonos_data)
+            # A full update includes the latest play state, which may have changed while fetching art
+            sonos_data.is_play_state_new()
+            live_state = sonos_data.state
+            state = state.replace(**{field: getattr(live_state, field) for field in PLAY_STATE_FIELDS})
+            display.update(code_image, images, state)
+            prefetch_next_art(session, sonos_data, state, display)
+        elif sonos_data.is_play_state_new():
+            _LOGGER.debug("Play state changed, updating play state only")
+            display.update_play_state(sonos_data.state)
         else:
             _LOGGER.debug("The new_track_info state is %s, no action taken", new_track_info)
     else:
@@ -261,22 +438,34 @@ def setup_logging():
             "Cannot write to %s, check permissions and ensure directory exists", log_path)
 
 
-async def main(loop):
-    """Main process for script."""
-    setup_logging()
-    log_git_hash()
-    show_details_timeout = getattr(
-        sonos_settings, "show_details_timeout", None)
-    overlay_text = getattr(sonos_settings, "overlay_text", None)
-    show_play_state = getattr(sonos_settings, "show_play_state", None)
-    
-
-    try:
-        display = DisplayController(loop, sonos_settings.show_details, sonos_settings.show_artist_and_album,
-                                    show_details_timeout, overlay_text, show_play_state, show_spotify_code)
-    except SonosDisplaySetupError:
-        loop.stop()
-        return
+def create_display(loop, screen_name, show_details_timeout, overlay_text, show_play_state):
+    """Return the display for a room using the configured render backend."""
+    options = (loop, sonos_settings.show_details, sonos_settings.show_artist_and_album,
+               show_details_timeout, overlay_text, show_play_state, show_spotify_code)
+    backend = getattr(sonos_settings, "display_backend", "tk")
+    # Backends are imported on demand so the framebuffer never loads Tk
+    if backend == "headless":
+        from headless_display import HeadlessDisplay
+        return HeadlessDisplay(*options)
+    if backend == "framebuffer":
+        from framebuffer_display import DEFAULT_DEVICE, FramebufferDisplay
+        return FramebufferDisplay(
+            *options,
+            device=screen_name or getattr(sonos_settings, "framebuffer_device", DEFAULT_DEVICE),
+            pixel_format=getattr(sonos_settings, "framebuffer_format", None),
+        )
+    if backend != "tk":
+        _LOGGER.warning("Unknown display backend '%s', using 'tk'", backend)
+    from display_controller import DisplayController
+    from tk_event_pump import FRAME_RATE
+    return DisplayController(*options, screen_name, getattr(sonos_settings, "tk_frame_rate", FRAME_RATE))
+
+
+def get_rooms():
+    """Return a dict of room names to display options from the settings."""
+    rooms = getattr(sonos_settings, "rooms_for_highres", None)
+    if rooms:
+        return rooms
 
     if sonos_settings.room_name_for_highres == "":
         print("No room name found in sonos_settings.py")
@@ -287,43 +476,87 @@ async def main(loop):
         sonos_room = input("Enter a Sonos room name for testing purposes>>>  ")
     else:
         sonos_room = sonos_settings.room_name_for_highres
-        _LOGGER.info("Monitoring room: %s", sonos_room)
+    return {sonos_room: {}}
+
+
+async def main(loop):
+    """Main process for script."""
+    setup_logging()
+    log_git_hash()
+    show_details_timeout = getattr(
+        sonos_settings, "show_details_timeout", None)
+    overlay_text = getattr(sonos_settings, "overlay_text", None)
+    show_play_state = getattr(sonos_settings, "show_play_state", None)
 
+    # One connection pool, set of caches and group topology is shared by every room
     session = ClientSession()
-    sonos_data = SonosData(
+    topology = SonosTopology(
         sonos_settings.sonos_http_api_address,
         sonos_settings.sonos_http_api_port,
-        sonos_room,
         session,
     )
 
-    async def webhook_callback():
-        """Callback to trigger after webhook is processed."""
+    async def room_redraw(sonos_data, display):
+        """Redraw callback for each monitored room."""
         await redraw(session, sonos_data, display)
 
-    webhook = SonosWebhook(display, sonos_data, webhook_callback)
+    monitors = []
+    for sonos_room, options in get_rooms().items():
+        try:
+            display = create_display(loop, options.get("screen"), show_details_timeout, overlay_text, show_play_state)
+        except SonosDisplaySetupError:
+            for monitor in monitors:
+                monitor.display.cleanup()
+            await session.close()
+            loop.stop()
+            return
+
+        _LOGGER.info("Monitoring room: %s", sonos_room)
+        sonos_data = SonosData(
+            sonos_settings.sonos_http_api_address,
+            sonos_settings.sonos_http_api_port,
+            sonos_room,
+            session,
+            topology,
+        )
+        polling_policy = create_policy(getattr(sonos_settings, "polling_policy", "adaptive"), POLLING_INTERVAL)
+        monitors.append(RoomMonitor(
+            sonos_data, display, room_redraw, polling_policy, WEBHOOK_INTERVAL,
+            getattr(sonos_settings, "webhook_coalesce_window", WEBHOOK_COALESCE_WINDOW),
+        ))
+
+    webhook = SonosWebhook(monitors, topology)
+    webhook.add_stats_provider("topology", lambda: topology.stats)
+    webhook.add_stats_provider("album_art_cache", lambda: art_cache.stats)
+    webhook.add_stats_provider("demaster_cache", lambda: demaster_cache.stats)
+    webhook.add_stats_provider("image_variant_cache", lambda: image_processor.variants.stats)
+    webhook.add_stats_provider("art_prefetch", lambda: art_prefetcher.stats)
+    if spotify:
+        webhook.add_stats_provider("spotify_search_cache", lambda: spotify.cache.stats)
+    if getattr(sonos_settings, "monitor_event_loop", False):
+        loop_monitor = LoopMonitor()
+        loop_monitor.start()
+        webhook.add_stats_provider("event_loop", lambda: loop_monitor.stats)
     await webhook.listen()
 
     for signame in ('SIGINT', 'SIGTERM', 'SIGQUIT'):
         loop.add_signal_handler(getattr(signal, signame), lambda: asyncio.ensure_future(
-            cleanup(loop, session, webhook, display)))
-
-    while True:
-        if sonos_data.webhook_active:
-            update_interval = WEBHOOK_INTERVAL
-        else:
-            update_interval = POLLING_INTERVAL
+            cleanup(loop, session, webhook, monitors)))
 
-        if time.time() - sonos_data.last_update > update_interval:
-            await sonos_data.refresh()
-            await redraw(session, sonos_data, display)
-        await asyncio.sleep(1)
+    for monitor in monitors:
+        monitor.start()
 
 
-async def cleanup(loop, session, webhook, display):
+async def cleanup(loop, session, webhook, monitors):
     """Cleanup tasks on shutdown."""
     _LOGGER.debug("Shutting down")
-    display.cleanup()
+    for monitor in monitors:
+        monitor.stop()
+        monitor.display.cleanup()
+    image_processor.shutdown()
+    demaster_cache.flush()
+    if spotify:
+        spotify.cache.flush()
     await session.close()
     await webhook.stop()
 
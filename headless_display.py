@@ -0,0 +1,128 @@
+"""
+Headless render backend which composes the display frame into a PIL image instead of drawing with Tk.
+"""
+from functools import lru_cache
+import logging
+
+from PIL import Image, ImageDraw, ImageFont
+
+from display_base import ART, DETAIL_VIEW, SPOTIFY_CODE, DisplayBase
+
+_LOGGER = logging.getLogger(__name__)
+
+FONT_FILES = ("consola.ttf", "DejaVuSansMono.ttf")
+# Tk font sizes are in points, drawn at 96 dpi
+FONT_SCALE = 96 / 72
+DETAIL_FONT_SIZE = 14
+PLAY_STATE_FONT_SIZE = 14
+LABEL_PADDING = 2
+SPOTIFY_CODE_Y = 40
+
+
+@lru_cache(maxsize=None)
+def load_font(size):
+    """Return the label font at a Tk point size, loaded once per size."""
+    for name in FONT_FILES:
+        try:
+            return ImageFont.truetype(name, round(size * FONT_SCALE))
+        except OSError:
+            continue
+    _LOGGER.warning("No TrueType font found, text will use the default bitmap font")
+    return ImageFont.load_default()
+
+
+def wrap_text(text, font, width):
+    """Return text wrapped at word boundaries to fit within `width` pixels, like a Tk label."""
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if line and font.getlength(candidate) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class HeadlessDisplay(DisplayBase):
+    """Composes the same album and detail views as the Tk display into in-memory images."""
+
+    def __init__(self, loop, show_details, show_artist_and_album, show_details_timeout, overlay_text, show_play_state, show_spotify_code, use_backlight=False):
+        """Initialize the headless display. The visible frame is available as `frame`."""
+        super().__init__(loop, show_details, show_artist_and_album, show_details_timeout, overlay_text, show_play_state, show_spotify_code, use_backlight)
+        self.blank_frame = Image.new("RGB", (self.SCREEN_W, self.SCREEN_H), "black")
+        self.album_view = self.blank_frame
+        self.detail_view = self.blank_frame
+        self.frame = self.blank_frame
+        self._content = None
+
+    def _present(self):
+        """Make the current view the visible frame."""
+        self.frame = self.detail_view if self.view == DETAIL_VIEW else self.album_view
+
+    def _blank(self):
+        """Make a black frame visible."""
+        self.frame = self.blank_frame
+
+    def _render(self, changes, code_image, images, display_trackname, detail_text, play_state_text, layout):
+        """Compose the detail view, and the album view if its art or Spotify Code changed."""
+        if not self.show_spotify_code or detail_text == "":
+            code_image = None
+        self._content = (code_image, images, display_trackname, detail_text, layout)
+        if ART in changes or SPOTIFY_CODE in changes:
+            self.album_view = self._compose_album(code_image, images)
+        self.detail_view = self._compose_detail(code_image, images, display_trackname, detail_text, play_state_text, layout)
+
+    def _render_play_state(self, play_state_text):
+        """Compose the detail view again with a new play state line."""
+        if self._content is None:
+            return
+        self.detail_view = self._compose_detail(*self._content[:4], play_state_text, self._content[4])
+        if self.is_showing:
+            self._present()
+
+    def _compose_album(self, code_image, images):
+        """Return the full screen album art view."""
+        frame = images[self.SCREEN_W].convert("RGB")
+        if code_image is not None:
+            self._paste_code(frame, code_image)
+        return frame
+
+    def _compose_detail(self, code_image, images, display_trackname, detail_text, play_state_text, layout):
+        """Return the detail view with thumbnail and labels."""
+        if self.overlay_text:
+            frame = images[self.SCREEN_W].convert("RGB")
+        else:
+            frame = self.blank_frame.copy()
+            thumb = images[layout.thumb_size]
+            frame.paste(thumb, ((self.SCREEN_W - thumb.width) // 2, int(layout.thumb_y - thumb.height / 2)))
+
+        draw = ImageDraw.Draw(frame)
+        self._draw_label(draw, display_trackname, layout.track_font_size, 600, layout.track_y)
+        if detail_text and self.show_artist_and_album:
+            self._draw_label(draw, detail_text, DETAIL_FONT_SIZE, 600, self.SCREEN_H - 10, bottom=True)
+        if self.show_play_state:
+            self._draw_label(draw, play_state_text, PLAY_STATE_FONT_SIZE, 700, 10)
+        if code_image is not None:
+            self._paste_code(frame, code_image)
+        return frame
+
+    def _draw_label(self, draw, text, font_size, wraplength, y, bottom=False):
+        """Draw centred white text on a black box, anchored at its top or bottom edge like a Tk label."""
+        font = load_font(font_size)
+        text = wrap_text(text, font, wraplength)
+        left, top, right, bottom_edge = draw.multiline_textbbox((0, 0), text, font=font, align="center")
+        width = right - left + 2 * LABEL_PADDING
+        height = bottom_edge - top + 2 * LABEL_PADDING
+        x = (self.SCREEN_W - width) // 2
+        if bottom:
+            y -= height
+        draw.rectangle((x, y, x + width - 1, y + height - 1), fill="black")
+        draw.multiline_text((x + LABEL_PADDING - left, y + LABEL_PADDING - top), text, font=font, fill="white", align="center")
+
+    def _paste_code(self, frame, code_image):
+        """Paste the Spotify Code where the Tk display places it."""
+        frame.paste(code_image, (int(self.SCREEN_W * 0.75 - code_image.width / 2), SPOTIFY_CODE_Y))
@@ -0,0 +1,147 @@
+"""
+Decode and resize album art in a worker pool so the event loop stays responsive.
+"""
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+import logging
+import multiprocessing
+
+from PIL import Image, ImageFile
+
+_LOGGER = logging.getLogger(__name__)
+
+ImageFile.LOAD_TRUNCATED_IMAGES = True
+
+RESAMPLE = Image.LANCZOS
+DEFAULT_VARIANT_ITEMS = 12
+
+
+def _open(source):
+    """Open raw image data or a file path."""
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    return Image.open(source)
+
+
+def decode_image(source):
+    """Fully decode an image so it is safe to hand to another thread."""
+    with _open(source) as image:
+        image.load()
+        return image.copy()
+
+
+def prepare_image(source, sizes, draft=True, resample=RESAMPLE):
+    """Decode a square image and return a dict of RGB images keyed by size."""
+    with _open(source) as image:
+        if draft:
+            # Let the JPEG decoder downscale by 1/2, 1/4 or 1/8 while still covering the largest size
+            largest = max(sizes)
+            image.draft("RGB", (largest, largest))
+        image = image.convert("RGB")
+    return {size: image.resize((size, size), resample) for size in sizes}
+
+
+class VariantCache():
+    """LRU of ready-to-display images keyed by (art key, size, resampling)."""
+
+    def __init__(self, max_items=DEFAULT_VARIANT_ITEMS):
+        """Initialize the cache."""
+        self.max_items = max_items
+        self._images = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """Return the hit/miss counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "items": len(self._images),
+        }
+
+    def get(self, key, size, resample=RESAMPLE):
+        """Return a cached image or None."""
+        image = self._images.get((key, size, resample))
+        if image is None:
+            self.misses += 1
+            return None
+        self._images.move_to_end((key, size, resample))
+        self.hits += 1
+        return image
+
+    def put(self, key, size, image, resample=RESAMPLE):
+        """Add an image, evicting the least recently used entries."""
+        if self.max_items <= 0:
+            return
+        self._images[(key, size, resample)] = image
+        self._images.move_to_end((key, size, resample))
+        while len(self._images) > self.max_items:
+            self._images.popitem(last=False)
+
+
+class ImageProcessor():
+    """Runs image decode, conversion and resizing off the event loop."""
+
+    def __init__(self, use_processes=False, workers=1, variant_items=DEFAULT_VARIANT_ITEMS):
+        """Initialize the worker pool."""
+        self.variants = VariantCache(variant_items)
+        if use_processes:
+            # Never fork a process which has Tk and other threads running
+            self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self.executor = ThreadPoolExecutor(workers, thread_name_prefix="image")
+
+    async def _run(self, func, *args):
+        """Run a function in the pool, returning None if the image is unusable."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.executor, func, *args)
+        except (OSError, ValueError, Image.DecompressionBombError) as err:
+            _LOGGER.warning("Image could not be processed [%s]", err)
+            return None
+
+    async def decode(self, source):
+        """Return a decoded image from raw data or a file path."""
+        return await self._run(decode_image, source)
+
+    def cached(self, key, sizes):
+        """Return prepared images if every size is cached for `key`, else None."""
+        images = {}
+        for size in sizes:
+            image = self.variants.get(key, size)
+            if image is None:
+                return None
+            images[size] = image
+        return images
+
+    async def prepare(self, source, sizes, key=None):
+        """Return a dict of RGB images resized to each of `sizes`.
+
+        Sizes already cached for `key` are reused without touching `source`.
+        """
+        images = {}
+        missing = []
+        for size in dict.fromkeys(sizes):
+            image = self.variants.get(key, size) if key else None
+            if image is None:
+                missing.append(size)
+            else:
+                images[size] = image
+
+        if missing:
+            resized = await self._run(prepare_image, source, tuple(missing))
+            if resized is None:
+                return None
+            images.update(resized)
+            if key:
+                for size, image in resized.items():
+                    self.variants.put(key, size, image)
+        return images
+
+    def shutdown(self):
+        """Stop the worker pool."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,86 @@
+"""
+Small helper to persist a dict as a JSON file between runs.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+SAVE_DELAY = 30
+
+
+class JsonStore():
+    """Load and atomically save a JSON object to a file.
+
+    Frequent changes are saved with `save_later`, which batches them into one
+    write in the default executor after a delay. `flush` writes any pending
+    changes immediately, for use on shutdown.
+    """
+
+    def __init__(self, path, save_delay=SAVE_DELAY):
+        """Initialize the store. A `path` of None makes the store a no-op."""
+        self.path = os.path.expanduser(path) if path else None
+        self.save_delay = save_delay
+        self._pending = None
+        self._save_handle = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Return the stored dict, or an empty dict if unavailable."""
+        if not self.path or not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Could not read %s, starting empty [%s]", self.path, err)
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return data
+
+    def save(self, data):
+        """Write the dict to disk, replacing the previous contents."""
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        # A delayed save may still be running in the executor
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as file:
+                    json.dump(data, file)
+                os.replace(tmp_path, self.path)
+            except OSError as err:
+                _LOGGER.warning("Could not write %s [%s]", self.path, err)
+
+    def save_later(self, data):
+        """Save the dict after the save delay, replacing any save still waiting.
+
+        The dict must not be changed afterwards, pass a copy.
+        """
+        if not self.path:
+            return
+        self._pending = data
+        if not self._save_handle:
+            loop = asyncio.get_running_loop()
+            self._save_handle = loop.call_later(self.save_delay, self._save_pending)
+
+    def _save_pending(self):
+        """Write the waiting dict in the executor."""
+        self._save_handle = None
+        data, self._pending = self._pending, None
+        if data is not None:
+            asyncio.get_running_loop().run_in_executor(None, self.save, data)
+
+    def flush(self):
+        """Write any waiting dict now."""
+        if self._save_handle:
+            self._save_handle.cancel()
+            self._save_handle = None
+        data, self._pending = self._pending, None
+        if data is not None:
+            self.save(data)
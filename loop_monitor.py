@@ -0,0 +1,55 @@
+"""
+Measures how long the asyncio event loop is blocked between iterations.
+"""
+import asyncio
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+CHECK_INTERVAL = 0.1
+STALL_THRESHOLD = 0.05
+
+
+class LoopMonitor():
+    """Samples event loop lag to spot code which blocks the loop thread."""
+
+    def __init__(self, interval=CHECK_INTERVAL, threshold=STALL_THRESHOLD):
+        """Initialize the monitor."""
+        self.interval = interval
+        self.threshold = threshold
+        self.task = None
+
+        self.samples = 0
+        self.stalls = 0
+        self.max_stall = 0
+        self.total_stall = 0
+
+    @property
+    def stats(self):
+        """Return the lag statistics in milliseconds."""
+        return {
+            "samples": self.samples,
+            "stalls": self.stalls,
+            "max_stall_ms": round(self.max_stall * 1000, 1),
+            "total_stall_ms": round(self.total_stall * 1000, 1),
+        }
+
+    def start(self):
+        """Start sampling in the background."""
+        if not self.task:
+            self.task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        """Sleep for a fixed interval and record any overshoot."""
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - start - self.interval
+            self.samples += 1
+            if lag > self.threshold:
+                self.stalls += 1
+                self.total_stall += lag
+                if lag > self.max_stall:
+                    self.max_stall = lag
+                _LOGGER.debug("Event loop blocked for %.0f ms", lag * 1000)
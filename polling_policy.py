@@ -0,0 +1,62 @@
+"""
+Policies deciding how long to wait between polls of `node-sonos-http-api`.
+"""
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FixedPollingPolicy():
+    """Poll at the same interval regardless of state."""
+
+    def __init__(self, interval):
+        """Initialize the policy."""
+        self.interval = interval
+
+    def next_interval(self, sonos_data):
+        """Return seconds until the next poll."""
+        return self.interval
+
+
+class AdaptivePollingPolicy():
+    """Poll quickly near expected track changes and back off while nothing is playing."""
+
+    def __init__(self, playing_interval=1, fast_interval=0.5, idle_interval=2, max_idle_interval=10, backoff=1.5, end_window=3):
+        """Initialize the policy."""
+        self.playing_interval = playing_interval
+        self.fast_interval = fast_interval
+        self.idle_interval = idle_interval
+        self.max_idle_interval = max_idle_interval
+        self.backoff = backoff
+        self.end_window = end_window
+        self._current_idle = None
+
+    def next_interval(self, sonos_data):
+        """Return seconds until the next poll based on the latest refreshed state."""
+        if sonos_data.status != "PLAYING":
+            if self._current_idle is None:
+                self._current_idle = self.idle_interval
+            else:
+                self._current_idle = min(self._current_idle * self.backoff, self.max_idle_interval)
+            return self._current_idle
+
+        if self._current_idle is not None:
+            _LOGGER.debug("Playback resumed, polling every %ss", self.playing_interval)
+            self._current_idle = None
+
+        if sonos_data.duration:
+            remaining = sonos_data.duration - sonos_data.elapsed
+            if remaining <= self.end_window:
+                return self.fast_interval
+            # Wake up in time for the end of the track rather than overshooting it
+            return max(self.fast_interval, min(self.playing_interval, remaining - self.end_window))
+        return self.playing_interval
+
+
+def create_policy(name, polling_interval):
+    """Return the polling policy configured by name."""
+    if name == "fixed":
+        return FixedPollingPolicy(polling_interval)
+    if name != "adaptive":
+        _LOGGER.warning("Unknown polling policy '%s', using adaptive", name)
+    return AdaptivePollingPolicy(playing_interval=polling_interval)
@@ -0,0 +1,74 @@
+"""
+Splits radio stream titles into artist, track name and album.
+
+Station specific formats are matched first using a table of rules, anything
+else is split on the most preferred separator found in the title.
+"""
+import re
+
+# Separators between artist, track name and album, most preferred first
+SEPARATORS = ("~", "˗", "*", "|", " - ", " / ")
+ALBUM_SEPARATOR = "~"
+
+# (name, title prefix, pattern for the rest of the title, stream URI pattern or None,
+#  artist, track name, album)
+# Outputs are format strings given the named groups of the pattern and `station`.
+RULES = (
+    # BBC streams send an empty song between tracks
+    ("bbc_idle", "BR P|TYPE=SNG|", r"TITLE \|ARTIST \|ALBUM", r"bbc_radio", "", "BBC {station}", ""),
+    ("br_idle", "BR P|TYPE=SNG|", r"TITLE \|ARTIST \|ALBUM", None, "", "{station}", ""),
+    ("br_song", "BR P|TYPE=SNG|", r"TITLE (?P<title>[^|]*)\|ARTIST (?P<artist>[^|]*)(?:\|.*)?", None,
+     "{artist}", "{title}", ""),
+)
+
+
+def capitalize_words(text):
+    """Return lower case text with the first letter of every word capitalized and single spaces between words."""
+    return " ".join(map(str.capitalize, text.split()))
+
+
+class RadioNormalizer():
+    """Splits radio titles using a rule table compiled once, falling back to separators."""
+
+    def __init__(self, rules=RULES, separators=SEPARATORS):
+        """Initialize the normalizer and compile its patterns."""
+        self.rules = [
+            (name, prefix, len(prefix), re.compile(pattern), re.compile(uri) if uri else None, outputs)
+            for name, prefix, pattern, uri, *outputs in rules
+        ]
+        self.rule_prefixes = tuple({rule[1] for rule in self.rules})
+        self.separators = separators
+
+    def match_rule(self, title, station, uri):
+        """Return (artist, track name, album) from the first matching rule, or None."""
+        if not title.startswith(self.rule_prefixes):
+            return None
+        for _, prefix, start, pattern, uri_pattern, outputs in self.rules:
+            if not title.startswith(prefix):
+                continue
+            match = pattern.fullmatch(title, start)
+            if match is None or (uri_pattern and not uri_pattern.search(uri or "")):
+                continue
+            fields = match.groupdict()
+            fields["station"] = station
+            return tuple([output.format_map(fields).strip() for output in outputs])
+        return None
+
+    def split(self, title):
+        """Return (artist, track name, album) split on the preferred separator, or None."""
+        for separator in self.separators:
+            if separator in title:
+                break
+        else:
+            return None
+
+        # Only the first three fields are ever shown
+        parts = title.casefold().split(separator, 3)
+        album = ""
+        if separator == ALBUM_SEPARATOR and len(parts) > 2:
+            album = capitalize_words(parts[2])
+        return capitalize_words(parts[0]), capitalize_words(parts[1]), album
+
+    def normalize(self, title, station, uri=""):
+        """Return (artist, track name, album) for a radio title, or None if it can't be split."""
+        return self.match_rule(title, station, uri) or self.split(title)
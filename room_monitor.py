@@ -0,0 +1,102 @@
+"""
+Ties a monitored Sonos room to its display, update scheduler and webhook queue.
+"""
+import asyncio
+import logging
+
+from update_scheduler import UpdateScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+COALESCE_WINDOW = 0.2
+
+
+class RoomMonitor():
+    """Keeps one display in sync with one Sonos room."""
+
+    def __init__(self, sonos_data, display, redraw, polling_policy, webhook_interval, coalesce_window=COALESCE_WINDOW):
+        """Initialize the monitor. `redraw(sonos_data, display)` is awaited after every refresh."""
+        self.sonos_data = sonos_data
+        self.display = display
+        self.redraw = redraw
+        self.coalesce_window = coalesce_window
+        self.scheduler = UpdateScheduler(sonos_data, self.update, polling_policy, webhook_interval)
+
+        self._pending_state = None
+        self._flush_handle = None
+        self._update_task = None
+
+        self.received = 0
+        self.coalesced = 0
+        self.superseded = 0
+
+    @property
+    def room(self):
+        """Return the monitored room name."""
+        return self.sonos_data.room
+
+    @property
+    def stats(self):
+        """Return the webhook counters."""
+        return {
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "superseded": self.superseded,
+        }
+
+    def start(self):
+        """Start polling until webhooks arrive."""
+        self.scheduler.start()
+
+    def stop(self):
+        """Cancel timers and any update in progress."""
+        self.scheduler.stop()
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._update_task:
+            self._update_task.cancel()
+            self._update_task = None
+
+    async def update(self):
+        """Redraw the display from the current data."""
+        await self.redraw(self.sonos_data, self.display)
+
+    def handle_volume_change(self, data):
+        """Update the play state line without a refresh or redraw."""
+        self.sonos_data.set_volume(data.get("newVolume", self.sonos_data.volume))
+        if self.sonos_data.is_play_state_new() and self.sonos_data.is_playing():
+            self.display.update_play_state(self.sonos_data.state)
+
+    def queue_state(self, state):
+        """Queue a state update, collapsing bursts within the coalescing window."""
+        self.received += 1
+        if self._pending_state is not None:
+            self.coalesced += 1
+        self._pending_state = state
+        if not self._flush_handle:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.coalesce_window, self._flush)
+
+    def _flush(self):
+        """Apply the newest queued state, superseding any update still in progress."""
+        self._flush_handle = None
+        state, self._pending_state = self._pending_state, None
+        if self._update_task and not self._update_task.done():
+            _LOGGER.debug("Newer state received for %s, abandoning redraw in progress", self.room)
+            self._update_task.cancel()
+            self.superseded += 1
+            # The abandoned redraw may not have shown the current track yet
+            self.sonos_data.mark_track_new()
+        self._update_task = asyncio.ensure_future(self._apply_state(state))
+
+    async def _apply_state(self, state):
+        """Refresh from a webhook payload and redraw."""
+        try:
+            changed = await self.sonos_data.refresh(state)
+            if changed or self.sonos_data.is_update_pending():
+                await self.update()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.exception("Problem during webhook update: %s", err)
+        finally:
+            self.scheduler.webhook_received()
@@ -0,0 +1,143 @@
+"""
+Group topology of the Sonos system, used to fetch state once per group coordinator.
+"""
+import asyncio
+import logging
+import time
+from urllib.parse import urljoin
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_MAX_AGE = 0.5
+
+
+class SonosTopology():
+    """Group membership learned from `/zones` and `topology-change` webhooks.
+
+    Without webhooks nothing reports group changes, so rooms which are polling
+    mark the topology stale and it is loaded again once webhooks resume.
+    """
+
+    def __init__(self, api_host, api_port, session, state_max_age=STATE_MAX_AGE):
+        """Initialize the topology, which is loaded on first use."""
+        self.base_url = f"http://{api_host}:{api_port}"
+        self.session = session
+        self.state_max_age = state_max_age
+
+        self._coordinators = None
+        self._stale = False
+        self._members = {}
+        self._volumes = {}
+        self._zones_task = None
+        self._states = {}
+
+        self.zones_fetches = 0
+        self.state_fetches = 0
+        self.shared_fetches = 0
+
+    @property
+    def stats(self):
+        """Return the fetch counters and current groups."""
+        return {
+            "zones_fetches": self.zones_fetches,
+            "state_fetches": self.state_fetches,
+            "shared_state_fetches": self.shared_fetches,
+            "groups": self._members,
+        }
+
+    def update(self, zones):
+        """Replace the topology from a `/zones` response or `topology-change` payload."""
+        coordinators = {}
+        members = {}
+        volumes = {}
+        now = time.time()
+        for zone in zones:
+            coordinator = zone["coordinator"]["roomName"]
+            members[coordinator] = []
+            for member in zone.get("members", []):
+                room = member["roomName"]
+                coordinators[room] = coordinator
+                members[coordinator].append(room)
+                volumes[room] = member.get("state", {}).get("volume")
+            coordinators[coordinator] = coordinator
+            state = zone["coordinator"].get("state")
+            if state:
+                self._remember_state(coordinator, state, now)
+
+        if coordinators != self._coordinators:
+            _LOGGER.debug("Sonos groups: %s", members)
+        self._coordinators = coordinators
+        self._stale = False
+        self._members = members
+        self._volumes = volumes
+
+    def invalidate(self):
+        """Mark the topology stale, to be loaded again on next use."""
+        self._stale = True
+
+    def _remember_state(self, coordinator, state, fetched_at):
+        """Cache a coordinator state so members polled shortly after share it."""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(state)
+        self._states[coordinator] = (fetched_at, future)
+
+    async def _fetch_zones(self):
+        """Load the topology from the API."""
+        self.zones_fetches += 1
+        async with self.session.get(urljoin(self.base_url, "zones")) as response:
+            self.update(await response.json())
+
+    async def coordinator(self, room):
+        """Return the coordinator of the group `room` belongs to."""
+        if self._coordinators is None or self._stale:
+            if not self._zones_task:
+                self._zones_task = asyncio.ensure_future(self._fetch_zones())
+            try:
+                await asyncio.shield(self._zones_task)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Could not load Sonos groups [%s]", err)
+            finally:
+                if self._zones_task and self._zones_task.done():
+                    self._zones_task = None
+        return (self._coordinators or {}).get(room, room)
+
+    def members(self, room):
+        """Return the other rooms grouped with `room` if it is a coordinator and the groups are current."""
+        if self._stale:
+            return []
+        return [member for member in self._members.get(room, []) if member != room]
+
+    def set_volume(self, room, volume):
+        """Track a room volume from a `volume-change` event."""
+        self._volumes[room] = volume
+
+    def member_state(self, room, coordinator, state):
+        """Return a coordinator state adjusted for a member room, which has its own volume."""
+        volume = self._volumes.get(room)
+        if room == coordinator or volume is None:
+            return state
+        return dict(state, volume=volume)
+
+    async def _fetch_state(self, coordinator):
+        """Fetch a coordinator state from the API."""
+        self.state_fetches += 1
+        url = urljoin(self.base_url, f"{coordinator}/state")
+        async with self.session.get(url) as response:
+            return await response.json()
+
+    async def fetch_state(self, room):
+        """Return the state of `room`, fetched at most once per group within the max age."""
+        coordinator = await self.coordinator(room)
+        cached = self._states.get(coordinator)
+        if cached and (not cached[1].done() or time.time() - cached[0] < self.state_max_age):
+            self.shared_fetches += 1
+            task = cached[1]
+        else:
+            task = asyncio.ensure_future(self._fetch_state(coordinator))
+            self._states[coordinator] = (time.time(), task)
+        try:
+            state = await asyncio.shield(task)
+        except Exception:
+            self._states.pop(coordinator, None)
+            raise
+        return self.member_state(room, coordinator, state)
@@ -1,7 +1,6 @@
 """
 Helper class to retrieve and process data from `node-http-sonos-api`.
 """
-from datetime import timedelta
 import logging
 import re
 import time
@@ -10,28 +9,44 @@ import sonos_settings
 
 from aiohttp import ClientConnectorError
 
+from radio_normalizer import RadioNormalizer
+from station_registry import find_unknown_radio_station_name
+from track_state import ART, FIELDS, PLAY_STATE, TRACK, TrackState
+
 
 _LOGGER = logging.getLogger(__name__)
 
 WEBHOOK_TIMEOUT = 130
 
+# Payload fields which affect what is shown, `elapsedTime` is deliberately left out
+TRACK_KEYS = ("type", "title", "artist", "album", "stationName", "uri", "duration", "albumArtUri", "absoluteAlbumArtUri")
+NEXT_TRACK_KEYS = ("title", "artist", "album", "albumArtUri", "absoluteAlbumArtUri")
+PLAY_MODE_KEYS = ("repeat", "shuffle", "crossfade")
+
+radio_titles = RadioNormalizer()
+
 
 class SonosData():
     """Holds all data related to the chosen Sonos speaker."""
 
-    def __init__(self, api_host, api_port, sonos_room, session):
-        """Initialize the object."""
+    def __init__(self, api_host, api_port, sonos_room, session, topology=None):
+        """Initialize the object. A shared `topology` fetches state once per group."""
         self.api_host = api_host
         self.api_port = api_port
         self.last_poll = 0
         self.last_webhook = 0
-        self.previous_image_uri = None
-        self.previous_track = None
         self.room = sonos_room
         self.session = session
+        self.topology = topology
         self.webhook_active = False
         self._speaker_uri = None
         self._track_is_new = True
+        self._play_state_is_new = False
+        self.state = TrackState()
+        self._fingerprint = None
+
+        self.refreshes = 0
+        self.elided_refreshes = 0
 
         self.type = ""
         self.raw_trackname = ""
@@ -40,14 +55,29 @@ class SonosData():
         self.album = ""
         self.station = ""
         self.duration = 0
+        self.elapsed = 0
+        self.uri = ""
         self.image_uri = ""
         self.status = ""
 
+        self.next_trackname = ""
+        self.next_artist = ""
+        self.next_album = ""
+        self.next_image_uri = ""
+
         self.volume = 0
         self.repeat = ""
         self.shuffle = ""
         self.crossfade = ""
 
+    @property
+    def stats(self):
+        """Return the refresh counters."""
+        return {
+            "refreshes": self.refreshes,
+            "elided": self.elided_refreshes,
+        }
+
     @property
     def last_update(self):
         if self.last_webhook > self.last_poll:
@@ -57,6 +87,7 @@ class SonosData():
     def set_room(self, room):
         """Change the actively monitored room."""
         self.room = room
+        self._fingerprint = None
         _LOGGER.info("Monitoring room: %s", room)
 
     def get_speaker_uri(self, json_data):
@@ -64,13 +95,34 @@ class SonosData():
         if self._speaker_uri:
             return self._speaker_uri
 
-        next_track_art = json_data['nextTrack'].get("absoluteAlbumArtUri", "")
+        next_track_art = (json_data.get('nextTrack') or {}).get("absoluteAlbumArtUri", "")
         match = re.search("(^https?:\/\/.*:1400)\/getaa\?.*", next_track_art)
         if match:
             self._speaker_uri = match.group(1)
             _LOGGER.debug("URL for %s found: %s", self.room, self._speaker_uri)
             return self._speaker_uri
 
+    def get_album_art_uri(self, track, json_data):
+        """Return the best album art URL for a track object from the state JSON."""
+        album_art_uri = track.get('albumArtUri', "")
+        speaker_uri = self.get_speaker_uri(json_data)
+        if album_art_uri.startswith('http'):
+            return album_art_uri
+        if speaker_uri and album_art_uri:
+            return f"{speaker_uri}{album_art_uri}"
+        return track.get('absoluteAlbumArtUri', "")
+
+    def set_next_track_info(self, payload):
+        """Update the upcoming track attributes from the JSON payload."""
+        next_track = payload.get('nextTrack') or {}
+        self.next_trackname = next_track.get('title', "")
+        self.next_artist = next_track.get('artist', "")
+        self.next_album = next_track.get('album', "")
+        if next_track:
+            self.next_image_uri = self.get_album_art_uri(next_track, payload)
+        else:
+            self.next_image_uri = ""
+
     def is_playing(self):
         """Return True if actively playing."""
         return self.status == "PLAYING"
@@ -81,9 +133,30 @@ class SonosData():
         self._track_is_new = False
         return is_new
 
+    def is_play_state_new(self):
+        """Return True if volume or play mode changed since last checked."""
+        is_new = self._play_state_is_new
+        self._play_state_is_new = False
+        return is_new
+
+    def set_volume(self, volume):
+        """Update the volume from a `volume-change` event."""
+        if volume != self.volume:
+            self.volume = volume
+            self.state = self.state.replace(volume=volume)
+            self._play_state_is_new = True
+
+    def is_update_pending(self):
+        """Return True if a track or play state change has not been drawn yet."""
+        return self._track_is_new or self._play_state_is_new
+
+    def mark_track_new(self):
+        """Force the next redraw to treat the current track as new."""
+        self._track_is_new = True
+
     def set_track_info(self, payload):
 
-        """Update attributes from the JSON payload. Returns new track_id or None."""
+        """Update attributes from the JSON payload. Returns False if there is nothing to show."""
         self.raw_trackname = payload['currentTrack'].get('title', "")
         self.artist = payload['currentTrack'].get('artist', "")
         self.album = payload['currentTrack'].get('album', "")
@@ -100,48 +173,14 @@ class SonosData():
               self.raw_trackname = self.station
 
            if self.artist == self.station and self.type == "radio" :
-              if self.raw_trackname.count("~") : c = "~"
-              elif self.raw_trackname.count("˗") : c = "˗"
-              elif self.raw_trackname.count("*") : c = "*"
-              elif self.raw_trackname.count("|") : c = "|"
-              elif self.raw_trackname.count(" - ") : c = " - "
-              elif self.raw_trackname.count(" / ") : c = " / "
-              else : c = ""
-
-              if c :
-                 oldstr=self.raw_trackname.casefold()
-                 splitstr = oldstr.split(c)
-                 SplitStr = self.raw_trackname.split(c)
-                 if self.raw_trackname.startswith("BR P|TYPE=SNG|") :
-                    if self.raw_trackname == "BR P|TYPE=SNG|TITLE |ARTIST |ALBUM" :
-                        if "bbc_radio" in self.uri :
-                            self.raw_trackname = "BBC " + self.station
-                        else :
-                            self.raw_trackname = self.station
-                        self.artist = ""
-                    else : 
-                        #self.artist = ' '.join(word[0].upper() + word[1:] for word in splitstr[3].split())[6:]
-                        self.artist = SplitStr[3][7:]
-                        #self.raw_trackname = ' '.join(word[0].upper() + word[1:] for word in splitstr[2].split())[5:]
-                        self.raw_trackname = SplitStr[2][6:]
-                    if c == "~" :
-                        self.album = ' '.join(word[0].upper() + word[1:] for word in splitstr[2].split())
-                    else :
-                        self.album = ""
-    #                    self.album = self.station
-                 else :
-                    self.artist = ' '.join(word[0].upper() + word[1:] for word in splitstr[0].split())
-                    self.raw_trackname = ' '.join(word[0].upper() + word[1:] for word in splitstr[1].split())
-                    if c == "~" :
-                        self.album = ' '.join(word[0].upper() + word[1:] for word in splitstr[2].split())
-                    else :
-                        self.album = ""
-    #                    self.album = self.station
+              normalized = radio_titles.normalize(self.raw_trackname, self.station, self.uri)
+              if normalized :
+                 self.artist, self.raw_trackname, self.album = normalized
 
         # Abort update if all data is empty
         if not any([self.album, self.artist, self.duration, self.station, self.raw_trackname]):
             _LOGGER.debug("No data returned by the API, skipping update")
-            return None
+            return False
 
         if self.type == "radio" and not self.station:
             # if not then try to look it up (usually because its played from Alexa)
@@ -153,21 +192,17 @@ class SonosData():
         else:
             self.trackname = self.raw_trackname
 
+        return True
 
-        track_id = self.artist
-        if self.trackname:
-            track_id += f" - {self.trackname}"
-        if self.album:
-            track_id += f" ({self.album})"
-        if self.duration:
-            track_id += f" - {timedelta(seconds=self.duration)}"
-        if self.station:
-            track_id += f" [{self.station}]"
-
-        return track_id
+    def snapshot(self):
+        """Return the current attributes as an immutable `TrackState`."""
+        return TrackState(**{name: getattr(self, name) for name in FIELDS})
 
     async def refresh(self, payload=None):
-        """Refresh the Sonos media data with provided payload or a new get request."""
+        """Refresh the Sonos media data with provided payload or a new get request.
+
+        Returns False if the payload matched the previous one and parsing was skipped.
+        """
         if payload:
             if not self.webhook_active:
                 _LOGGER.info("Switching to webhook updates")
@@ -180,22 +215,40 @@ class SonosData():
             url = urljoin(base_url, f"{self.room}/state")
 
             try:
-                async with self.session.get(url) as response:
-                    obj = await response.json()
+                # Groups are only kept up to date by webhooks, polled rooms fetch their own state
+                if self.topology and self.webhook_active:
+                    obj = await self.topology.fetch_state(self.room)
+                else:
+                    if self.topology:
+                        self.topology.invalidate()
+                    async with self.session.get(url) as response:
+                        obj = await response.json()
             except ClientConnectorError as err:
                 self.status = "API error"
+                self._fingerprint = None
                 _LOGGER.error("Connection failed. Ensure `node-sonos-http-api` is running: (%s)", err)
-                return
+                return True
             except Exception as err:
                 self.status = "API error"
+                self._fingerprint = None
                 _LOGGER.exception("Error connecting to Sonos API: %s", err)
-                return
+                return True
+
+        self.refreshes += 1
+        self.elapsed = obj.get('elapsedTime') or 0
+        fingerprint = payload_fingerprint(obj)
+        if fingerprint == self._fingerprint:
+            self.elided_refreshes += 1
+            return False
+        self._fingerprint = fingerprint
 
         self.status = obj.get('playbackState', "API error")
 
         # Don't bother processing the payload unless media is actively playing
         if self.status != "PLAYING":
-            return
+            if self.state.status != self.status:
+                self.state = self.state.replace(status=self.status)
+            return True
 
         self.type = obj['currentTrack']['type']
         self.duration = obj['currentTrack']['duration']
@@ -203,60 +256,47 @@ class SonosData():
         if self.type == "line_in":
             uri = obj['currentTrack']['uri']
             if uri.startswith('x-sonos-htastream:'):
-                self.type = track_id = "TV"
+                self.type = self.trackname = "TV"
             else:
-                track_id = "Line-In"
+                self.trackname = "Line-In"
             self.image_uri = None
-            self.trackname = track_id
             self.artist = ""
             self.album = ""
             self.station = ""
         else:
-            track_id = self.set_track_info(obj)
+            if not self.set_track_info(obj):
+                return True
 
-            if not track_id:
-                return
+            self.image_uri = self.get_album_art_uri(obj['currentTrack'], obj)
+            self.set_next_track_info(obj)
 
-            album_art_uri = obj['currentTrack'].get('albumArtUri', "")
-            speaker_uri = self.get_speaker_uri(obj)
-            if album_art_uri.startswith('http'):
-                self.image_uri = album_art_uri
-            elif speaker_uri and album_art_uri:
-                self.image_uri = f"{speaker_uri}{album_art_uri}"
-            else:
-                self.image_uri = obj['currentTrack'].get('absoluteAlbumArtUri', "")
+        state = self.snapshot()
+        changes = state.changes(self.state)
+        self.state = state
 
-        if track_id != self.previous_track:
-            _LOGGER.info("New track: %s", track_id)
-        elif self.image_uri != self.previous_image_uri:
-            _LOGGER.debug("Updated image URI: %s", self.image_uri)
+        if PLAY_STATE in changes:
+            self._play_state_is_new = True
+
+        if TRACK in changes:
+            _LOGGER.info("New track: %s", state.description)
+        elif ART in changes:
+            _LOGGER.debug("Updated image URI: %s", state.image_uri)
         else:
-            return
+            return True
 
-        self.previous_image_uri = self.image_uri
-        self.previous_track = track_id
         self._track_is_new = True
-
-        if self.webhook_active and (self.last_poll - self.last_webhook > WEBHOOK_TIMEOUT):
-            _LOGGER.warning("Webhook activity timed out, falling back to polling")
-            self.webhook_active = False
-
-
-
-def find_unknown_radio_station_name(filename):
-    # BBC streams started via alexa don't return their real name, which is annoying... but fixable:
-    # if you find other stations which are not shown then you can add them below. Please put up on github will a pull request if you do
-    if filename == "bbc_radio_two.m3u8": return "BBC Radio 2"
-    if filename == "bbc_6music.m3u8": return "BBC Radio 6 Music"
-    if filename == "bbc_radio_hereford_worcester.m3u8": return "BBC Hereford & Worcester"
-    if filename == "bbc_radio_one.m3u8": return "BBC Radio 1"
-    if filename == "bbc_1xtra.m3u8": return "BBC Radio 1Xtra"
-    if filename == "bbc_radio_two.m3u8": return "BBC Radio 2"
-    if filename == "bbc_radio_three.m3u8": return "BBC Radio 3"
-    if filename == "bbc_radio_fourfm.m3u8": return "BBC Radio 4"
-    if filename == "bbc_radio_five_live.m3u8": return "BBC Radio 5 Live"
-    if filename == "bbc_radio_five_live_sports_extra.m3u8": return "BBC Radio 5 Live Sports Extra"
-    if filename == "bbc_world_service.m3u8": return "BBC World Service"
-
-    # if not found:
-    return "Radio"
+        return True
+
+
+def payload_fingerprint(payload):
+    """Return the fields of a state payload which affect what is shown."""
+    track = payload.get('currentTrack') or {}
+    next_track = payload.get('nextTrack') or {}
+    play_mode = payload.get('playMode') or {}
+    return (
+        payload.get('playbackState'),
+        payload.get('volume'),
+        tuple(track.get(key) for key in TRACK_KEYS),
+        tuple(next_track.get(key) for key in NEXT_TRACK_KEYS),
+        tuple(play_mode.get(key) for key in PLAY_MODE_KEYS),
+    )
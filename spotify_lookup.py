@@ -0,0 +1,130 @@
+"""
+Long-lived Spotify search client which never blocks the event loop.
+"""
+import asyncio
+from functools import partial
+import logging
+import re
+import time
+
+try:
+    import spotipy
+    from spotipy.oauth2 import SpotifyClientCredentials
+except ImportError:
+    spotipy = None
+
+from json_store import JsonStore
+
+_LOGGER = logging.getLogger(__name__)
+
+SPOTIFY_CODE_URL = "https://scannables.scdn.co/uri/plain/png/368A7D/white/320/"
+QUOTES_PATTERN = re.compile("´|`|'|’")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+DEFAULT_CACHE_TTL = 30 * 24 * 60 * 60
+DEFAULT_NEGATIVE_CACHE_TTL = 24 * 60 * 60
+
+
+def normalize_search_key(artist, trackname, market):
+    """Return a cache key which ignores case, quotes and spacing differences."""
+    def normalize(value):
+        return WHITESPACE_PATTERN.sub(" ", QUOTES_PATTERN.sub("", value or "")).strip().casefold()
+    return "\x1f".join([normalize(artist), normalize(trackname), market or ""])
+
+
+class SpotifySearchCache():
+    """Persistent cache of search results with expiry, including "not found" results."""
+
+    def __init__(self, path=None, ttl=DEFAULT_CACHE_TTL, negative_ttl=DEFAULT_NEGATIVE_CACHE_TTL):
+        """Initialize the cache, loading unexpired results from `path` if given."""
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._store = JsonStore(path)
+
+        now = time.time()
+        self._results = {
+            key: entry for key, entry in self._store.load().items()
+            if isinstance(entry, dict) and entry.get("expires", 0) > now
+        }
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """Return the hit/miss counters."""
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round((lookups - self.misses) / lookups, 3) if lookups else None,
+            "items": len(self._results),
+        }
+
+    def flush(self):
+        """Save any results not yet persisted."""
+        self._store.flush()
+
+    def get(self, key):
+        """Return (found, result) where result is (track URI, album art URL) or None."""
+        entry = self._results.get(key)
+        if entry is None or entry["expires"] <= time.time():
+            self.misses += 1
+            return False, None
+        if entry["uri"] is None:
+            self.negative_hits += 1
+            return True, None
+        self.hits += 1
+        return True, (entry["uri"], entry["art"])
+
+    def put(self, key, result):
+        """Store a search result, or None if the search found nothing."""
+        now = time.time()
+        if result is None:
+            entry = {"uri": None, "art": None, "expires": now + self.negative_ttl}
+        else:
+            entry = {"uri": result[0], "art": result[1], "expires": now + self.ttl}
+        self._results[key] = entry
+        for expired in [old_key for old_key, old_entry in self._results.items() if old_entry["expires"] <= now]:
+            del self._results[expired]
+        self._store.save_later(dict(self._results))
+
+
+class SpotifyLookup():
+    """Searches Spotify for tracks using a single authorised client."""
+
+    def __init__(self, client_id, client_secret, market=None, cache=None):
+        """Initialize the client. The credentials manager reuses its token until it expires."""
+        credentials = SpotifyClientCredentials(client_id, client_secret)
+        self.client = spotipy.Spotify(client_credentials_manager=credentials)
+        self.market = market
+        self.cache = cache or SpotifySearchCache()
+
+    def _search(self, artist, trackname):
+        """Run a blocking search, returning (track URI, album art URL) or None."""
+        query = "artist:" + QUOTES_PATTERN.sub("", artist) + " track:" + QUOTES_PATTERN.sub("", trackname)
+        results = self.client.search(q=query, type="track", limit=1, market=self.market)
+        if results['tracks']['total'] == 0:
+            return None
+        track = results['tracks']['items'][0]  # Find top result
+        return track['uri'], track['album']['images'][0]['url']
+
+    async def search_track(self, artist, trackname):
+        """Return (track URI, album art URL) for the best match, or None."""
+        key = normalize_search_key(artist, trackname, self.market)
+        found, result = self.cache.get(key)
+        if found:
+            _LOGGER.debug("Spotify search cache hit for %s - %s", artist, trackname)
+            return result
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(None, partial(self._search, artist, trackname))
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Problem searching Spotify, defaulting to Sonos system [%s]", err)
+            return None
+
+        self.cache.put(key, result)
+        return result
@@ -0,0 +1,111 @@
+"""
+Registry of radio station names and logos for streams which don't report a station name.
+"""
+import json
+import logging
+import os
+import re
+from urllib.parse import urlsplit
+
+import sonos_settings
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_STATIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "radio_stations.json")
+UNKNOWN_STATION = "Radio"
+
+
+def stream_key(stream):
+    """Return the lookup key for a stream filename, URL or Sonos URI.
+
+    `bbc_radio_two.m3u8`, `http://host/path/bbc_radio_two.m3u8?x=1` and
+    `x-sonosapi-hls:stations~playlist~bbc_radio_two?sid=303` all give `bbc_radio_two`.
+    """
+    path = urlsplit(stream.replace("%7e", "~").replace("%7E", "~")).path
+    name = re.split(r"[/~:]", path)[-1]
+    return os.path.splitext(name)[0].casefold()
+
+
+class StationRegistry():
+    """Station names indexed by stream key, with prefix and regex fallbacks."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.stations = {}
+        self.patterns = []
+        self.logos = {}
+
+    def add(self, key, name, logo=None):
+        """Register the station name, and optionally a logo image, for a stream key."""
+        self.stations[stream_key(key)] = name
+        if logo:
+            self.logos[name] = os.path.expanduser(logo)
+
+    def add_pattern(self, name, prefix=None, regex=None, logo=None):
+        """Register a fallback for stream keys starting with `prefix` or matching `regex`."""
+        if regex:
+            match = re.compile(regex).search
+        else:
+            match = lambda key, prefix=prefix.casefold(): key.startswith(prefix)
+        self.patterns.append((match, name))
+        if logo:
+            self.logos[name] = os.path.expanduser(logo)
+
+    def load(self, path):
+        """Add the stations from a JSON data file."""
+        try:
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Could not load radio stations from %s: %s", path, err)
+            return
+        for key, station in data.get("stations", {}).items():
+            self.add(key, station["name"], station.get("logo"))
+        for pattern in data.get("patterns", []):
+            self.add_pattern(pattern["name"], pattern.get("prefix"), pattern.get("regex"), pattern.get("logo"))
+
+    def lookup(self, stream, default=None):
+        """Return the station name for a stream, or `default` if it is not known."""
+        if not stream:
+            return default
+        key = stream_key(stream)
+        name = self.stations.get(key)
+        if name:
+            return name
+        for match, name in self.patterns:
+            if match(key):
+                return name
+        return default
+
+    def logo(self, name):
+        """Return the path of a logo image for a station name, or None."""
+        return self.logos.get(name)
+
+
+_registry = None
+
+
+def get_registry():
+    """Return the shared registry, loading the data file and user settings on first use."""
+    global _registry
+    if _registry is None:
+        _registry = StationRegistry()
+        # User settings take priority, so their patterns are tried first and their stations added last
+        for pattern in getattr(sonos_settings, "radio_station_patterns", []):
+            _registry.add_pattern(**pattern)
+        _registry.load(getattr(sonos_settings, "radio_stations_file", DEFAULT_STATIONS_FILE))
+        for key, station in getattr(sonos_settings, "radio_stations", {}).items():
+            if isinstance(station, dict):
+                _registry.add(key, station["name"], station.get("logo"))
+            else:
+                _registry.add(key, station)
+        for name, logo in getattr(sonos_settings, "radio_station_logos", {}).items():
+            _registry.logos[name] = os.path.expanduser(logo)
+    return _registry
+
+
+def find_unknown_radio_station_name(filename):
+    """Return the station name for a stream which didn't report one."""
+    # BBC streams started via Alexa don't return their real name. Add other stations
+    # to radio_stations.json, and please put up a pull request on github if you do
+    return get_registry().lookup(filename, UNKNOWN_STATION)
@@ -0,0 +1,90 @@
+"""
+Drives the Tk event loop from asyncio on a fixed cadence.
+"""
+import _tkinter
+import logging
+import time
+import tkinter as tk
+
+_LOGGER = logging.getLogger(__name__)
+
+FRAME_RATE = 20
+
+
+class TkEventPump():
+    """Processes Tk events once per frame and batches display flushes into at most one per frame.
+
+    Event processing stops when the frame budget is used up, leaving the rest for the next frame.
+    """
+
+    def __init__(self, loop, root, frame_rate=FRAME_RATE, budget=None):
+        """Initialize the pump. The budget defaults to half of each frame."""
+        self.loop = loop
+        self.root = root
+        self.interval = 1 / frame_rate
+        self.budget = budget if budget is not None else self.interval / 2
+        self._handle = None
+        self._flush_requested = False
+
+        self.ticks = 0
+        self.events = 0
+        self.flushes = 0
+        self.over_budget = 0
+        self.tk_time = 0
+        self.max_tick_time = 0
+
+    @property
+    def stats(self):
+        """Return the number of ticks, events and flushes and the time spent in Tk."""
+        return {
+            "ticks": self.ticks,
+            "events": self.events,
+            "flushes": self.flushes,
+            "over_budget": self.over_budget,
+            "mean_tick_ms": round(self.tk_time / self.ticks * 1000, 2) if self.ticks else 0,
+            "max_tick_ms": round(self.max_tick_time * 1000, 2),
+        }
+
+    def start(self):
+        """Start pumping events."""
+        if not self._handle:
+            self._handle = self.loop.call_soon(self._tick)
+
+    def stop(self):
+        """Stop pumping events."""
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+
+    def request_flush(self):
+        """Ask for pending display changes to be drawn on the next frame."""
+        self._flush_requested = True
+
+    def _tick(self):
+        """Process pending events within the budget, then flush display changes if requested."""
+        start = time.perf_counter()
+        deadline = start + self.budget
+        try:
+            while self.root.tk.dooneevent(_tkinter.DONT_WAIT):
+                self.events += 1
+                if time.perf_counter() > deadline:
+                    self.over_budget += 1
+                    break
+            if self._flush_requested:
+                self._flush_requested = False
+                self.root.update_idletasks()
+                self.flushes += 1
+        except tk.TclError as err:
+            _LOGGER.error("Tk event processing stopped: %s", err)
+            self._handle = None
+            return
+
+        elapsed = time.perf_counter() - start
+        self.ticks += 1
+        self.tk_time += elapsed
+        self.max_tick_time = max(self.max_tick_time, elapsed)
+        if elapsed > self.interval:
+            _LOGGER.debug("Tk frame took %.1f ms", elapsed * 1000)
+
+        # Keep a fixed cadence however long this frame took
+        self._handle = self.loop.call_later(max(0, self.interval - elapsed), self._tick)
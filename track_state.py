@@ -0,0 +1,98 @@
+"""
+Immutable snapshot of what a Sonos room is playing.
+"""
+from datetime import timedelta
+
+TRACK_FIELDS = ("type", "trackname", "artist", "album", "station", "duration")
+TEXT_FIELDS = ("trackname", "artist", "album", "station")
+ART_FIELDS = ("image_uri",)
+PLAY_STATE_FIELDS = ("volume", "repeat", "shuffle", "crossfade")
+FIELDS = ("status",) + TRACK_FIELDS + ("uri",) + ART_FIELDS + PLAY_STATE_FIELDS
+
+# Change categories reported by TrackState.changes
+STATUS = "status"
+TRACK = "track"
+TEXT = "text"
+ART = "art"
+PLAY_STATE = "play_state"
+
+_GROUPS = (
+    (TRACK, TRACK_FIELDS),
+    (TEXT, TEXT_FIELDS),
+    (ART, ART_FIELDS),
+    (PLAY_STATE, PLAY_STATE_FIELDS),
+)
+
+
+class TrackState():
+    """Frozen view of the playing track with precomputed hashes for change detection."""
+
+    __slots__ = FIELDS + ("_keys", "_hashes")
+
+    def __init__(self, **fields):
+        """Initialize the snapshot. Fields which are not given default to empty values."""
+        for name in FIELDS:
+            object.__setattr__(self, name, fields.pop(name, 0 if name in ("duration", "volume") else ""))
+        if fields:
+            raise TypeError(f"Unknown TrackState fields: {', '.join(fields)}")
+
+        keys = {STATUS: self.status}
+        for group, names in _GROUPS:
+            keys[group] = tuple(getattr(self, name) for name in names)
+        object.__setattr__(self, "_keys", keys)
+        object.__setattr__(self, "_hashes", {group: hash(key) for group, key in keys.items()})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TrackState is immutable, use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("TrackState is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, TrackState):
+            return NotImplemented
+        return not self.changes(other)
+
+    def __hash__(self):
+        return hash(tuple(self._hashes.values()))
+
+    def __repr__(self):
+        return f"TrackState({self.status}: {self.description})"
+
+    @property
+    def identity(self):
+        """Return the precomputed hash identifying the track."""
+        return self._hashes[TRACK]
+
+    @property
+    def description(self):
+        """Return a readable description of the track for logging."""
+        description = self.artist
+        if self.trackname:
+            description += f" - {self.trackname}"
+        if self.album:
+            description += f" ({self.album})"
+        if self.duration:
+            description += f" - {timedelta(seconds=self.duration)}"
+        if self.station:
+            description += f" [{self.station}]"
+        return description
+
+    def as_dict(self):
+        """Return the fields as a dict."""
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def replace(self, **changes):
+        """Return a copy with some fields changed."""
+        fields = self.as_dict()
+        fields.update(changes)
+        return TrackState(**fields)
+
+    def changes(self, other):
+        """Return the set of change categories between this snapshot and `other`."""
+        if other is None:
+            return {STATUS, TRACK, TEXT, ART, PLAY_STATE}
+        return {
+            group for group, value in self._hashes.items()
+            if value != other._hashes[group] or self._keys[group] != other._keys[group]
+        }
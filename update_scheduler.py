@@ -0,0 +1,92 @@
+"""
+Timer driven refresh scheduling for a monitored Sonos room.
+"""
+import asyncio
+import logging
+
+from sonos_user_data import WEBHOOK_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UpdateScheduler():
+    """Polls a SonosData instance only when a timer is due, resetting timers on webhooks."""
+
+    def __init__(self, sonos_data, callback, polling_policy, webhook_interval, webhook_timeout=WEBHOOK_TIMEOUT):
+        """Initialize the scheduler. `callback` is awaited after every poll which may need a redraw."""
+        self.sonos_data = sonos_data
+        self.callback = callback
+        self.polling_policy = polling_policy
+        self.webhook_interval = webhook_interval
+        self.webhook_timeout = webhook_timeout
+
+        self._poll_handle = None
+        self._webhook_timeout_handle = None
+        self._poll_task = None
+        self._stopped = False
+
+    def start(self):
+        """Poll immediately and keep polling until a webhook arrives."""
+        self._stopped = False
+        self._schedule_poll(0)
+
+    def stop(self):
+        """Cancel all timers and any poll in progress."""
+        # A cancelled poll or webhook update must not arm the timers again
+        self._stopped = True
+        for handle in (self._poll_handle, self._webhook_timeout_handle, self._poll_task):
+            if handle:
+                handle.cancel()
+        self._poll_handle = self._webhook_timeout_handle = self._poll_task = None
+
+    def next_poll_interval(self):
+        """Return the delay until the next poll."""
+        if self.sonos_data.webhook_active:
+            return self.webhook_interval
+        return self.polling_policy.next_interval(self.sonos_data)
+
+    def _schedule_poll(self, delay):
+        """(Re)arm the poll timer."""
+        if self._stopped:
+            return
+        if self._poll_handle:
+            self._poll_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._poll_handle = loop.call_later(delay, self._start_poll)
+
+    def _start_poll(self):
+        """Timer callback to run a poll, unless one is still running."""
+        self._poll_handle = None
+        if self._poll_task and not self._poll_task.done():
+            return
+        self._poll_task = asyncio.ensure_future(self._poll())
+
+    async def _poll(self):
+        """Refresh from the API and redraw, then schedule the next poll."""
+        try:
+            changed = await self.sonos_data.refresh()
+            if changed or self.sonos_data.is_update_pending():
+                await self.callback()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.exception("Problem during scheduled update: %s", err)
+        finally:
+            if not self._poll_handle:
+                self._schedule_poll(self.next_poll_interval())
+
+    def webhook_received(self):
+        """Push back the poll and webhook timeout timers after a webhook update."""
+        if self._stopped:
+            return
+        loop = asyncio.get_running_loop()
+        self._schedule_poll(self.webhook_interval)
+        if self._webhook_timeout_handle:
+            self._webhook_timeout_handle.cancel()
+        self._webhook_timeout_handle = loop.call_later(self.webhook_timeout, self._webhook_timed_out)
+
+    def _webhook_timed_out(self):
+        """Fall back to polling when webhooks stop arriving."""
+        self._webhook_timeout_handle = None
+        if self.sonos_data.webhook_active:
+            _LOGGER.warning("Webhook activity timed out, falling back to polling")
+            self.sonos_data.webhook_active = False
+        self._schedule_poll(0)
@@ -1,17 +1,30 @@
 """Helper class to handle webhook callbacks from node-sonos-http-api and various REST commands."""
 import copy
 from distutils.util import strtobool
+import logging
 
 from aiohttp import web
 
+_LOGGER = logging.getLogger(__name__)
+
 
 class SonosWebhook:
-    def __init__(self, display, sonos_data, callback):
-        """Initialize the webhook handler."""
-        self.callback = callback
-        self.display = display
+    def __init__(self, monitors, topology=None):
+        """Initialize the webhook handler for one or more room monitors."""
+        self.monitors = {monitor.room: monitor for monitor in monitors}
+        self.primary = monitors[0]
         self.runner = None
-        self.sonos_data = sonos_data
+        self.stats_providers = {}
+        self.topology = topology
+
+        for monitor in monitors:
+            self.add_stats_provider(f"webhook:{monitor.room}", lambda monitor=monitor: monitor.stats)
+            self.add_stats_provider(f"refresh:{monitor.room}", lambda monitor=monitor: monitor.sonos_data.stats)
+            self.add_stats_provider(f"display:{monitor.room}", lambda monitor=monitor: monitor.display.stats)
+
+    def add_stats_provider(self, name, provider):
+        """Register a callable returning a dict of statistics for `/stats`."""
+        self.stats_providers[name] = provider
 
     async def listen(self):
         """Start listening server."""
@@ -20,6 +33,7 @@ class SonosWebhook:
             [
                 web.post("/", self.handle_webhook),
                 web.get("/status", self.get_status),
+                web.get("/stats", self.get_stats),
                 web.post("/set-room", self.set_room),
                 web.post("/show-detail", self.show_detail),
             ]
@@ -29,25 +43,50 @@ class SonosWebhook:
         site = web.TCPSite(self.runner, "0.0.0.0", 8080)
         await site.start()
 
+    def get_monitor(self, room):
+        """Return the monitor for a room, or the first configured one if no room is given."""
+        if not room:
+            return self.primary
+        return self.monitors.get(room)
+
     async def get_status(self, request):
         """Report the status of the application."""
-        payload = copy.copy(vars(self.sonos_data))
+        monitor = self.get_monitor(request.query.get("room"))
+        if not monitor:
+            return web.HTTPNotFound(reason="Room not monitored")
+        payload = copy.copy(vars(monitor.sonos_data))
         payload.pop("session")
+        payload.pop("topology")
+        payload["state"] = payload["state"].as_dict()
+        return web.json_response(payload)
+
+    async def get_stats(self, request):
+        """Report cache and performance statistics."""
+        payload = {name: provider() for name, provider in self.stats_providers.items()}
         return web.json_response(payload)
 
     async def set_room(self, request):
         """Set the monitored room."""
         payload = await request.post()
         room = payload.get("room")
-        self.sonos_data.set_room(room)
+        monitor = self.get_monitor(payload.get("current_room"))
+        if not monitor:
+            return web.HTTPNotFound(reason="Room not monitored")
+        self.monitors.pop(monitor.room, None)
+        monitor.sonos_data.set_room(room)
+        self.monitors[room] = monitor
         return web.Response(text="OK")
 
     async def show_detail(self, request):
         """Set the monitored room."""
-        if not self.sonos_data.is_playing():
+        payload = await request.post()
+        monitor = self.get_monitor(payload.get("room"))
+        if not monitor:
+            return web.HTTPNotFound(reason="Room not monitored")
+
+        if not monitor.sonos_data.is_playing():
             return web.HTTPBadRequest(reason="Not playing")
 
-        payload = await request.post()
         detail = payload.get("detail")
         if not detail:
             return web.HTTPBadRequest(reason="Parameter 'detail' must be provided")
@@ -56,18 +95,44 @@ class SonosWebhook:
         timeout = payload.get("timeout")
         if timeout:
             timeout = int(timeout)
-        self.display.show_album(detail, timeout)
+        monitor.display.show_album(detail, timeout)
         return web.Response(text="OK")
 
     async def handle_webhook(self, request):
         """Handle a webhook received from node-sonos-http-api."""
         json = await request.json()
+        data = json.get("data")
+        if json["type"] == "topology-change":
+            if self.topology and isinstance(data, list):
+                self.topology.update(data)
+            return web.Response(text="OK")
+
+        if not isinstance(data, dict):
+            return web.Response(text="OK")
+
+        room = data.get("roomName")
         if json["type"] == "transport-state":
-            if json["data"]["roomName"] == self.sonos_data.room:
-                await self.sonos_data.refresh(json["data"]["state"])
-                await self.callback()
+            self.dispatch_state(room, data["state"])
+        elif json["type"] == "volume-change":
+            if self.topology:
+                self.topology.set_volume(room, data.get("newVolume"))
+            monitor = self.monitors.get(room)
+            if monitor:
+                monitor.handle_volume_change(data)
         return web.Response(text="OK")
 
+    def dispatch_state(self, room, state):
+        """Queue a state for its room and any monitored rooms grouped under it."""
+        monitor = self.monitors.get(room)
+        if monitor:
+            monitor.queue_state(state)
+        if not self.topology:
+            return
+        for member in self.topology.members(room):
+            monitor = self.monitors.get(member)
+            if monitor:
+                monitor.queue_state(self.topology.member_state(member, room, state))
+
     async def stop(self):
         """Stop the listening server."""
         if self.runner: